@@ -13,14 +13,19 @@ Topics covered:
 """
 
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import time
 import asyncio
 from datetime import datetime
 from typing import List
 import httpx
 
-app = FastAPI(title="Async Basics API", version="1.0.0")
+app = FastAPI(
+    title="Async Basics API",
+    version="1.0.0",
+    # Encode every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse
+)
 
 
 # ============================================================================
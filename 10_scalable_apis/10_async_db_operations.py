@@ -11,10 +11,11 @@ Topics covered:
 - Best practices for async DB operations
 
 Installation:
-    pip install aiosqlite databases sqlalchemy[asyncio]
+    pip install aiosqlite databases sqlalchemy[asyncio] orjson
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import aiosqlite
@@ -171,6 +172,8 @@ async def lifespan(app: FastAPI):
 app = FastAPI(
     title="Async DB Operations API",
     version="1.0.0",
+    # Encode every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
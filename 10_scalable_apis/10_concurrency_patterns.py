@@ -6,24 +6,63 @@ This module demonstrates advanced concurrency patterns in FastAPI.
 
 Topics covered:
 - asyncio.gather() for parallel execution
-- asyncio.wait_for() with timeouts
+- asyncio.timeout() for deadlines
 - Semaphores for rate limiting
 - Task management
 - Error handling in concurrent operations
 
 Installation:
-    pip install httpx aiofiles
+    pip install httpx aiofiles orjson
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional
 import asyncio
+import atexit
+import functools
 import httpx
+import logging
+import logging.handlers
+import os
+import queue
 import time
 from datetime import datetime
+from types import MappingProxyType
 
-app = FastAPI(title="Concurrency Patterns API", version="1.0.0")
+# ============================================================================
+# Logging Configuration
+# ============================================================================
+
+# Records are only enqueued on the event loop; a listener thread does the
+# formatting and the blocking stdout write.
+_log_queue = queue.SimpleQueue()
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(
+    logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+)
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+logger.propagate = False
+
+# Interactive docs are served unless ENVIRONMENT is explicitly "production".
+ENABLE_DOCS = os.getenv("ENVIRONMENT") != "production"
+
+app = FastAPI(
+    title="Concurrency Patterns API",
+    version="1.0.0",
+    docs_url="/docs" if ENABLE_DOCS else None,
+    redoc_url="/redoc" if ENABLE_DOCS else None,
+    openapi_url="/openapi.json" if ENABLE_DOCS else None,
+    # Encode every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse,
+)
 
 
 # ============================================================================
@@ -165,21 +204,14 @@ async def error_handling_return_exceptions():
     
     duration = time.time() - start
     
-    processed_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            processed_results.append({
-                "task": i + 1,
-                "status": "failed",
-                "error": str(result)
-            })
-        else:
-            processed_results.append({
-                "task": i + 1,
-                "status": "success",
-                "data": result
-            })
-    
+    # Single pass: build each entry directly instead of append-looping
+    processed_results = [
+        {"task": i, "status": "failed", "error": str(result)}
+        if isinstance(result, Exception)
+        else {"task": i, "status": "success", "data": result}
+        for i, result in enumerate(results, start=1)
+    ]
+
     return {
         "results": processed_results,
         "execution_time": round(duration, 2),
@@ -188,7 +220,7 @@ async def error_handling_return_exceptions():
 
 
 # ============================================================================
-# SECTION 3: Timeouts with asyncio.wait_for()
+# SECTION 3: Timeouts with asyncio.timeout()
 # ============================================================================
 
 async def slow_operation():
@@ -197,23 +229,32 @@ async def slow_operation():
     return {"data": "Operation completed"}
 
 
+async def with_timeout(operation, timeout: float):
+    """
+    Await an operation under a deadline.
+    
+    asyncio.timeout() arms a single timer handle on the running task,
+    unlike asyncio.wait_for() which wraps the coroutine in an extra task.
+    """
+    async with asyncio.timeout(timeout):
+        return await operation
+
+
 @app.get("/timeout/basic")
 async def timeout_basic():
     """
-    Demonstrates timeout handling with asyncio.wait_for()
+    Demonstrates timeout handling with asyncio.timeout()
     """
     try:
         start = time.time()
         
         # Wait maximum 2 seconds
-        result = await asyncio.wait_for(
-            slow_operation(),
-            timeout=2.0
-        )
+        async with asyncio.timeout(2.0):
+            result = await slow_operation()
         
         return result
         
-    except asyncio.TimeoutError:
+    except TimeoutError:
         duration = time.time() - start
         return {
             "error": "Operation timed out",
@@ -230,8 +271,8 @@ async def timeout_multiple_with_fallback():
     """
     async def safe_fetch(operation, timeout: float, fallback):
         try:
-            return await asyncio.wait_for(operation, timeout=timeout)
-        except asyncio.TimeoutError:
+            return await with_timeout(operation, timeout=timeout)
+        except TimeoutError:
             return fallback
     
     start = time.time()
@@ -343,10 +384,10 @@ async def long_running_task(task_id: str, duration: int):
     try:
         for i in range(duration):
             await asyncio.sleep(1)
-            print(f"Task {task_id}: {i + 1}/{duration} seconds")
+            logger.info("Task %s: %d/%d seconds", task_id, i + 1, duration)
         return {"task_id": task_id, "status": "completed", "duration": duration}
     except asyncio.CancelledError:
-        print(f"Task {task_id} was cancelled")
+        logger.info("Task %s was cancelled", task_id)
         raise
 
 
@@ -462,33 +503,51 @@ async def list_tasks():
 # SECTION 6: Real-World Example - Data Aggregation
 # ============================================================================
 
-async def fetch_weather(city: str):
-    """Simulate fetching weather data"""
-    await asyncio.sleep(0.5)
-    return {
+# The payloads depend only on the city, so they are built once per city and
+# shared as read-only mappings; only the simulated latency runs per call.
+
+@functools.lru_cache(maxsize=1024)
+def _weather_body(city: str):
+    return MappingProxyType({
         "city": city,
         "temperature": 20 + hash(city) % 15,
         "condition": "Sunny"
-    }
+    })
+
+
+@functools.lru_cache(maxsize=1024)
+def _news_body(city: str):
+    return MappingProxyType({
+        "city": city,
+        "headlines": (f"Breaking news in {city}", f"Local events in {city}")
+    })
+
+
+@functools.lru_cache(maxsize=1024)
+def _traffic_body(city: str):
+    return MappingProxyType({
+        "city": city,
+        "traffic_level": "moderate",
+        "delays": "10 minutes average"
+    })
+
+
+async def fetch_weather(city: str):
+    """Simulate fetching weather data"""
+    await asyncio.sleep(0.5)
+    return _weather_body(city)
 
 
 async def fetch_news(city: str):
     """Simulate fetching news"""
     await asyncio.sleep(0.8)
-    return {
-        "city": city,
-        "headlines": [f"Breaking news in {city}", f"Local events in {city}"]
-    }
+    return _news_body(city)
 
 
 async def fetch_traffic(city: str):
     """Simulate fetching traffic data"""
     await asyncio.sleep(0.3)
-    return {
-        "city": city,
-        "traffic_level": "moderate",
-        "delays": "10 minutes average"
-    }
+    return _traffic_body(city)
 
 
 @app.get("/aggregate/city-info/{city}")
@@ -503,9 +562,9 @@ async def aggregate_city_info(city: str):
     try:
         # Fetch all data concurrently with timeout
         weather, news, traffic = await asyncio.gather(
-            asyncio.wait_for(fetch_weather(city), timeout=2.0),
-            asyncio.wait_for(fetch_news(city), timeout=2.0),
-            asyncio.wait_for(fetch_traffic(city), timeout=2.0),
+            with_timeout(fetch_weather(city), timeout=2.0),
+            with_timeout(fetch_news(city), timeout=2.0),
+            with_timeout(fetch_traffic(city), timeout=2.0),
             return_exceptions=True
         )
         
@@ -557,9 +616,9 @@ async def concurrency_best_practices():
             "recommendation": "Always handle exceptions in production code"
         },
         "timeouts": {
-            "use": "asyncio.wait_for() to prevent hanging operations",
+            "use": "asyncio.timeout() to prevent hanging operations",
             "critical_for": ["External API calls", "Database queries", "File operations"],
-            "pattern": "try/except asyncio.TimeoutError with fallback values"
+            "pattern": "try/except TimeoutError with fallback values"
         },
         "rate_limiting": {
             "use": "asyncio.Semaphore() to limit concurrent operations",
@@ -605,7 +664,7 @@ async def root():
             "cancel_task": "DELETE /tasks/cancel/my-task",
             "list_tasks": "GET /tasks/list"
         },
-        "docs": "/docs"
+        "docs": "/docs" if ENABLE_DOCS else None
     }
 
 
@@ -618,7 +677,7 @@ if __name__ == "__main__":
     print("\nPatterns demonstrated:")
     print("  • Parallel execution with asyncio.gather()")
     print("  • Error handling in concurrent operations")
-    print("  • Timeouts with asyncio.wait_for()")
+    print("  • Timeouts with asyncio.timeout()")
     print("  • Rate limiting with Semaphores")
     print("  • Background task management")
     print("\nTry:")
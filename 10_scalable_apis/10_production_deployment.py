@@ -12,15 +12,22 @@ Covered:
 """
 
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+import asyncio
 import logging
+import orjson
+import threading
 import time
 import psutil
 import os
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
 from datetime import datetime
 from contextlib import asynccontextmanager
+from typing import Dict
 
 # ============================================================================
 # Logging Configuration
@@ -39,6 +46,161 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# Process Handles
+# ============================================================================
+
+# Values that never change for the life of a worker. Each worker imports
+# this module after the fork (no preload_app), so the PID is its own.
+_PID = os.getpid()
+_PROC = psutil.Process(_PID)
+_CPU_COUNT = psutil.cpu_count()
+
+# Bytes per GiB. MiB figures are whole numbers (>> 20), but free disk stays a
+# float in GiB: a shift would report a disk with 900 MB left as 0
+_GIB = 1 << 30
+
+# open_files() readlinks every descriptor just to build a list we only take
+# the length of; num_fds() (POSIX) / num_handles() (Windows) is one read.
+# Note these count sockets and pipes too, not only regular files.
+if hasattr(_PROC, "num_fds"):
+    _count_open_files = _PROC.num_fds
+else:
+    _count_open_files = _PROC.num_handles
+
+
+# ============================================================================
+# Cached Clock
+# ============================================================================
+
+# Handlers read a pre-formatted ISO timestamp instead of building and
+# formatting a datetime per request. A background task started in lifespan
+# refreshes it, so it is at most CLOCK_RESOLUTION seconds stale.
+CLOCK_RESOLUTION = 0.1
+_timestamp = datetime.utcnow().isoformat()
+
+
+async def _tick_clock():
+    """Refresh the cached timestamp until cancelled"""
+    global _timestamp
+    while True:
+        _timestamp = datetime.utcnow().isoformat()
+        await asyncio.sleep(CLOCK_RESOLUTION)
+
+
+# ============================================================================
+# System Sampler
+# ============================================================================
+
+# psutil.virtual_memory() parses /proc/meminfo on every call. System memory
+# is sampled once per SYSTEM_SAMPLE_INTERVAL instead, so the parse rate is
+# independent of how often /metrics and /health/detailed are hit, and
+# percent/available always come from the same sample.
+#
+# System-wide CPU is sampled here too. psutil.cpu_percent(interval=None)
+# reports the delta since the previous call in this process, so if both
+# endpoints called it, each would reset the other's window. Apart from the
+# priming call in lifespan, the sampler is its only caller, so every reader
+# sees the same SYSTEM_SAMPLE_INTERVAL-long window; 0.0 until the first tick.
+SYSTEM_SAMPLE_INTERVAL = 1.0
+_sys_mem = psutil.virtual_memory()
+_sys_cpu = 0.0
+
+
+async def _sample_system():
+    """Refresh the cached system memory and CPU samples until cancelled"""
+    global _sys_mem, _sys_cpu
+    while True:
+        await asyncio.sleep(SYSTEM_SAMPLE_INTERVAL)
+        _sys_mem = psutil.virtual_memory()
+        _sys_cpu = psutil.cpu_percent(interval=None)
+
+
+# ============================================================================
+# Request Metrics
+# ============================================================================
+
+class Counter:
+    """
+    Monotonic counter sharded per thread.
+    
+    inc() only touches the calling thread's slot, so the request path takes
+    no lock; the shards are summed when /metrics is scraped. Under the
+    event loop there is a single shard, i.e. a plain int increment.
+    """
+    
+    def __init__(self):
+        self._shards: Dict[int, int] = defaultdict(int)
+    
+    def inc(self, amount: int = 1):
+        self._shards[threading.get_ident()] += amount
+    
+    def value(self) -> int:
+        # list() snapshots the values so a thread adding its first shard
+        # can't change the dict size mid-iteration
+        return sum(list(self._shards.values()))
+
+
+class Histogram:
+    """
+    Bucketed histogram using the hot/cold shard scheme from the Prometheus
+    Go client.
+    
+    observe() only writes to the hot shard. collect() flips which shard is
+    hot, yields once so any observer still holding the old index finishes,
+    then drains the now-cold shard into the running totals. A scrape never
+    touches buckets an observation is writing to.
+    """
+    
+    def __init__(self, buckets):
+        self._bounds = tuple(sorted(buckets))
+        size = len(self._bounds) + 1  # last slot is +Inf
+        self._counts = (array("Q", [0] * size), array("Q", [0] * size))
+        self._sums = [0.0, 0.0]
+        self._hot = 0
+        self._totals = array("Q", [0] * size)
+        self._total_sum = 0.0
+        self._collect_lock = asyncio.Lock()
+    
+    def observe(self, value: float):
+        hot = self._hot
+        self._counts[hot][bisect_left(self._bounds, value)] += 1
+        self._sums[hot] += value
+    
+    async def collect(self) -> dict:
+        """Drain observations and return cumulative bucket counts"""
+        async with self._collect_lock:
+            cold = self._hot
+            self._hot = cold ^ 1
+            await asyncio.sleep(0)
+            
+            counts = self._counts[cold]
+            for i, count in enumerate(counts):
+                self._totals[i] += count
+                counts[i] = 0
+            self._total_sum += self._sums[cold]
+            self._sums[cold] = 0.0
+            
+            buckets = {}
+            cumulative = 0
+            for bound, count in zip(self._bounds + ("+Inf",), self._totals):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            
+            return {
+                "buckets": buckets,
+                "sum": self._total_sum,
+                "count": cumulative
+            }
+
+
+requests_total = Counter()
+requests_failed = Counter()
+request_latency = Histogram(
+    (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+
 # ============================================================================
 # Application Lifespan
 # ============================================================================
@@ -58,6 +220,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Worker class: Uvicorn (ASGI)")
     logger.info(f"Environment: {os.getenv('ENVIRONMENT', 'production')}")
     
+    # Prime the non-blocking CPU samplers so the first /metrics scrape
+    # reports a real delta instead of 0.0
+    _PROC.cpu_percent(interval=None)
+    psutil.cpu_percent(interval=None)
+    
+    clock_task = asyncio.create_task(_tick_clock())
+    system_task = asyncio.create_task(_sample_system())
+    
     # Initialize resources
     # - Database connection pools
     # - Redis connections
@@ -74,6 +244,9 @@ async def lifespan(app: FastAPI):
     logger.info("👋 Application Shutting Down")
     logger.info("="*70)
     
+    clock_task.cancel()
+    system_task.cancel()
+    
     # Cleanup resources
     # - Close database connections
     # - Close Redis connections
@@ -87,12 +260,23 @@ async def lifespan(app: FastAPI):
 # FastAPI Application
 # ============================================================================
 
+# Interactive docs are served unless ENVIRONMENT is explicitly "production".
+# Disabling them there also skips building the OpenAPI schema on first hit.
+ENABLE_DOCS = os.getenv("ENVIRONMENT") != "production"
+
+# X-Request-ID / X-Process-Time response headers. On unless OBSERVABILITY=0;
+# the test suite turns them off except for the tests that check them.
+OBSERVABILITY = os.getenv("OBSERVABILITY", "1") == "1"
+
 app = FastAPI(
     title="Production-Ready Scalable API",
     description="Example of production deployment configuration",
     version="1.0.0",
-    docs_url="/docs",
-    redoc_url="/redoc",
+    docs_url="/docs" if ENABLE_DOCS else None,
+    redoc_url="/redoc" if ENABLE_DOCS else None,
+    openapi_url="/openapi.json" if ENABLE_DOCS else None,
+    # Encode every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -124,7 +308,6 @@ app.add_middleware(
 
 
 # Request ID Middleware (for tracking)
-@app.middleware("http")
 async def add_request_id(request: Request, call_next):
     """Add unique request ID for tracking"""
     import uuid
@@ -139,6 +322,10 @@ async def add_request_id(request: Request, call_next):
     return response
 
 
+if OBSERVABILITY:
+    app.middleware("http")(add_request_id)
+
+
 # Process Time Middleware (for monitoring)
 @app.middleware("http")
 async def add_process_time(request: Request, call_next):
@@ -148,7 +335,13 @@ async def add_process_time(request: Request, call_next):
     response = await call_next(request)
     
     process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(round(process_time, 4))
+    if OBSERVABILITY:
+        response.headers["X-Process-Time"] = str(round(process_time, 4))
+    
+    requests_total.inc()
+    request_latency.observe(process_time)
+    if response.status_code >= 500:
+        requests_failed.inc()
     
     # Log slow requests
     if process_time > 1.0:
@@ -197,7 +390,7 @@ async def health_check():
     """
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _timestamp,
         "version": "1.0.0"
     }
 
@@ -212,8 +405,9 @@ async def detailed_health_check():
     - Monitoring dashboards
     """
     # Get system metrics
-    cpu_percent = psutil.cpu_percent(interval=0.1)
-    memory = psutil.virtual_memory()
+    # Latest background samples; reading them never resets a CPU window
+    cpu_percent = _sys_cpu
+    memory = _sys_mem
     disk = psutil.disk_usage('/')
     
     # Check database connection (example)
@@ -222,15 +416,15 @@ async def detailed_health_check():
     
     health_status = {
         "status": "healthy" if database_healthy else "unhealthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _timestamp,
         "version": "1.0.0",
-        "uptime_seconds": time.time() - psutil.Process(os.getpid()).create_time(),
+        "uptime_seconds": time.time() - _PROC.create_time(),
         "system": {
             "cpu_percent": cpu_percent,
             "memory_percent": memory.percent,
-            "memory_available_mb": memory.available / (1024 * 1024),
+            "memory_available_mb": memory.available >> 20,
             "disk_percent": disk.percent,
-            "disk_free_gb": disk.free / (1024 * 1024 * 1024)
+            "disk_free_gb": round(disk.free / _GIB, 1)
         },
         "services": {
             "database": "healthy" if database_healthy else "unhealthy",
@@ -240,7 +434,7 @@ async def detailed_health_check():
     }
     
     status_code = 200 if database_healthy else 503
-    return JSONResponse(content=health_status, status_code=status_code)
+    return ORJSONResponse(content=health_status, status_code=status_code)
 
 
 @app.get("/health/ready")
@@ -259,7 +453,7 @@ async def readiness_check():
     
     is_ready = database_ready and cache_ready
     
-    return JSONResponse(
+    return ORJSONResponse(
         content={
             "ready": is_ready,
             "database": database_ready,
@@ -284,129 +478,181 @@ async def liveness_check():
 # Metrics Endpoint
 # ============================================================================
 
+# Prometheus text exposition format; Starlette appends "; charset=utf-8"
+METRICS_MEDIA_TYPE = "text/plain; version=0.0.4"
+
+
+def _metric(name: str, kind: str, help_text: str, value, labels: str = "") -> str:
+    """Render one sample with its HELP/TYPE header"""
+    return f"# HELP {name} {help_text}\n# TYPE {name} {kind}\n{name}{labels} {value}\n"
+
+
+def _histogram(name: str, help_text: str, data: dict) -> str:
+    """Render a collected Histogram as _bucket/_sum/_count samples"""
+    lines = [f"# HELP {name} {help_text}\n# TYPE {name} histogram\n"]
+    for bound, count in data["buckets"].items():
+        lines.append(f'{name}_bucket{{le="{bound}"}} {count}\n')
+    lines.append(f"{name}_sum {data['sum']}\n{name}_count {data['count']}\n")
+    return "".join(lines)
+
+
+def _collect_metrics() -> list:
+    """
+    Gather process and system stats as Prometheus text samples.
+    
+    psutil reads /proc synchronously, so this runs in a worker thread.
+    Process CPU uses interval=None: it returns the delta since the previous
+    call instead of sleeping to take a fresh sample. System CPU and memory
+    come from the background sampler.
+    """
+    memory = _sys_mem
+    
+    # oneshot() caches /proc/<pid>/stat across the reads below
+    with _PROC.oneshot():
+        memory_info = _PROC.memory_info()
+        cpu_percent = _PROC.cpu_percent(interval=None)
+        threads = _PROC.num_threads()
+    
+    return [
+        _metric("process_info", "gauge", "Process identity.", 1, f'{{pid="{_PID}"}}'),
+        _metric("process_cpu_percent", "gauge", "Process CPU usage in percent.", cpu_percent),
+        _metric("process_resident_memory_bytes", "gauge", "Resident memory size in bytes.", memory_info.rss),
+        _metric("process_threads", "gauge", "Number of OS threads.", threads),
+        _metric("process_open_fds", "gauge", "Number of open file descriptors.", _count_open_files()),
+        _metric("system_cpu_count", "gauge", "Number of logical CPUs.", _CPU_COUNT),
+        _metric("system_cpu_percent", "gauge", "System-wide CPU usage in percent.", _sys_cpu),
+        _metric("system_memory_percent", "gauge", "System memory usage in percent.", memory.percent),
+        _metric("system_memory_available_bytes", "gauge", "Available system memory in bytes.", memory.available),
+        _metric("http_requests_total", "counter", "Total HTTP requests.", requests_total.value()),
+        _metric("http_requests_failed_total", "counter", "HTTP requests that returned 5xx.", requests_failed.value()),
+    ]
+
+
 @app.get("/metrics")
 async def metrics():
     """
     Expose metrics for monitoring systems (Prometheus, Datadog, etc.)
     
+    Samples are written straight to the Prometheus text format, so the
+    endpoint can be scraped without a JSON translator.
+    
     In production, use proper metrics libraries:
     - prometheus_client
     - statsd
     - datadog
     """
-    process = psutil.Process(os.getpid())
-    
-    memory_info = process.memory_info()
-    
-    return {
-        "process": {
-            "pid": os.getpid(),
-            "cpu_percent": process.cpu_percent(),
-            "memory_mb": memory_info.rss / (1024 * 1024),
-            "threads": process.num_threads(),
-            "open_files": len(process.open_files())
-        },
-        "system": {
-            "cpu_count": psutil.cpu_count(),
-            "cpu_percent": psutil.cpu_percent(interval=0.1),
-            "memory_percent": psutil.virtual_memory().percent,
-            "memory_available_mb": psutil.virtual_memory().available / (1024 * 1024)
-        },
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    buf = await asyncio.to_thread(_collect_metrics)
+    buf.append(_histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency in seconds.",
+        await request_latency.collect()
+    ))
+    return Response(content="".join(buf), media_type=METRICS_MEDIA_TYPE)
 
 
 # ============================================================================
 # Example Business Endpoints
 # ============================================================================
 
+# Static payload: encoded once at import, served as raw bytes
+_ROOT_BYTES = orjson.dumps({
+    "message": "Production-Ready Scalable API",
+    "version": "1.0.0",
+    "environment": os.getenv("ENVIRONMENT", "production"),
+    "documentation": "/docs" if ENABLE_DOCS else None,
+    "health_check": "/health"
+})
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "message": "Production-Ready Scalable API",
-        "version": "1.0.0",
-        "environment": os.getenv("ENVIRONMENT", "production"),
-        "documentation": "/docs",
-        "health_check": "/health"
-    }
+    return Response(content=_ROOT_BYTES, media_type="application/json")
+
+
+# Static payload: encoded once at import, served as raw bytes
+_DATA_BYTES = orjson.dumps({
+    "data": [
+        {"id": 1, "name": "Item 1"},
+        {"id": 2, "name": "Item 2"},
+        {"id": 3, "name": "Item 3"}
+    ],
+    "count": 3
+})
 
 
 @app.get("/api/data")
 async def get_data():
     """Example data endpoint"""
-    return {
-        "data": [
-            {"id": 1, "name": "Item 1"},
-            {"id": 2, "name": "Item 2"},
-            {"id": 3, "name": "Item 3"}
-        ],
-        "count": 3
-    }
+    return Response(content=_DATA_BYTES, media_type="application/json")
 
 
 # ============================================================================
 # Production Configuration Tips
 # ============================================================================
 
-@app.get("/production-config")
-async def production_config():
-    """Production configuration best practices"""
-    return {
-        "gunicorn_uvicorn": {
-            "command": "gunicorn 10_production_deployment:app --workers 4 --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000",
-            "workers": "(2 * CPU_cores) + 1",
-            "worker_class": "uvicorn.workers.UvicornWorker",
-            "timeout": 30,
-            "graceful_timeout": 10,
-            "keep_alive": 5
+# Static payload: encoded once at import, served as raw bytes
+_PRODUCTION_CONFIG_BYTES = orjson.dumps({
+    "gunicorn_uvicorn": {
+        "command": "gunicorn 10_production_deployment:app --workers 4 --worker-class uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000",
+        "workers": "(2 * CPU_cores) + 1",
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "timeout": 30,
+        "graceful_timeout": 10,
+        "keep_alive": 5
+    },
+    "environment_variables": {
+        "DATABASE_URL": "postgresql://...",
+        "REDIS_URL": "redis://...",
+        "SECRET_KEY": "Use secrets management (AWS Secrets Manager, etc.)",
+        "ENVIRONMENT": "production",
+        "LOG_LEVEL": "INFO"
+    },
+    "docker": {
+        "base_image": "python:3.12-slim",
+        "expose_port": 8000,
+        "health_check": "curl -f http://localhost:8000/health || exit 1",
+        "user": "Run as non-root user"
+    },
+    "kubernetes": {
+        "replicas": 3,
+        "resources": {
+            "requests": {"cpu": "250m", "memory": "256Mi"},
+            "limits": {"cpu": "500m", "memory": "512Mi"}
         },
-        "environment_variables": {
-            "DATABASE_URL": "postgresql://...",
-            "REDIS_URL": "redis://...",
-            "SECRET_KEY": "Use secrets management (AWS Secrets Manager, etc.)",
-            "ENVIRONMENT": "production",
-            "LOG_LEVEL": "INFO"
-        },
-        "docker": {
-            "base_image": "python:3.12-slim",
-            "expose_port": 8000,
-            "health_check": "curl -f http://localhost:8000/health || exit 1",
-            "user": "Run as non-root user"
-        },
-        "kubernetes": {
-            "replicas": 3,
-            "resources": {
-                "requests": {"cpu": "250m", "memory": "256Mi"},
-                "limits": {"cpu": "500m", "memory": "512Mi"}
-            },
-            "probes": {
-                "liveness": "/health/live",
-                "readiness": "/health/ready"
-            }
-        },
-        "monitoring": {
-            "health_checks": "/health, /health/detailed",
-            "metrics": "/metrics",
-            "logging": "Structured JSON logging",
-            "tracing": "OpenTelemetry or similar",
-            "alerts": "Error rate, latency, resource usage"
-        },
-        "security": {
-            "https": "Always use HTTPS in production",
-            "cors": "Configure allowed origins",
-            "rate_limiting": "Implement rate limiting",
-            "authentication": "Use OAuth2, JWT, or API keys",
-            "secrets": "Never hardcode secrets"
-        },
-        "performance": {
-            "connection_pooling": "For databases and caches",
-            "caching": "Redis, Memcached",
-            "compression": "GZip middleware",
-            "cdn": "For static assets",
-            "database_indexes": "On frequently queried columns"
+        "probes": {
+            "liveness": "/health/live",
+            "readiness": "/health/ready"
         }
+    },
+    "monitoring": {
+        "health_checks": "/health, /health/detailed",
+        "metrics": "/metrics",
+        "logging": "Structured JSON logging",
+        "tracing": "OpenTelemetry or similar",
+        "alerts": "Error rate, latency, resource usage"
+    },
+    "security": {
+        "https": "Always use HTTPS in production",
+        "cors": "Configure allowed origins",
+        "rate_limiting": "Implement rate limiting",
+        "authentication": "Use OAuth2, JWT, or API keys",
+        "secrets": "Never hardcode secrets"
+    },
+    "performance": {
+        "connection_pooling": "For databases and caches",
+        "caching": "Redis, Memcached",
+        "compression": "GZip middleware",
+        "cdn": "For static assets",
+        "database_indexes": "On frequently queried columns"
     }
+})
+
+
+@app.get("/production-config")
+async def production_config():
+    """Production configuration best practices"""
+    return Response(content=_PRODUCTION_CONFIG_BYTES, media_type="application/json")
 
 
 if __name__ == "__main__":
@@ -428,6 +674,9 @@ if __name__ == "__main__":
         "10_production_deployment:app",
         host="0.0.0.0",
         port=8003,
-        reload=True,  # Only for development!
-        log_level="info"
+        loop="uvloop",
+        http="httptools",
+        # Reload spawns a file-watcher process; only pay for it in development
+        reload=os.getenv("ENVIRONMENT", "production") == "development",
+        log_level=os.getenv("LOG_LEVEL", "info").lower()
     )
@@ -0,0 +1,90 @@
+"""
+Shared fixtures for the Scalable APIs tests
+===========================================
+
+Requests are sent in-process through httpx's ASGITransport instead of
+Starlette's TestClient, which runs the app in a worker thread and hops
+back into it for every request. Each app gets one AsyncClient for the
+whole session, reused by every test on the session event loop. The app's
+lifespan runs around its client, so startup state such as the database
+pool exists before the first request.
+"""
+
+import asyncio
+import os
+import sys
+from contextlib import AsyncExitStack
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+
+# Skip the request-ID / process-time header middleware in the example apps.
+# Set before the test module imports them; the header tests build their own
+# app with it switched back on.
+os.environ.setdefault("OBSERVABILITY", "0")
+
+# Opt-in wall-clock profile of the run: PROFILE_TESTS=1 pytest ...
+# Yappi's wall clock charges time spent awaiting to the coroutine that
+# awaited, where cProfile would attribute it to the event loop.
+PROFILE_TESTS = os.getenv("PROFILE_TESTS") == "1"
+
+
+def pytest_configure(config):
+    """
+    Run the suite on uvloop, the loop uvicorn uses for these apps.
+    
+    The policy is set before pytest-asyncio creates the session loop, so
+    every test and fixture runs on it. uvloop is not available on Windows.
+    """
+    if sys.platform != "win32":
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    
+    if PROFILE_TESTS:
+        import yappi
+        yappi.set_clock_type("wall")
+        yappi.start(profile_threads=False)
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Report the functions with the most wall-clock time when PROFILE_TESTS=1"""
+    if not PROFILE_TESTS:
+        return
+    import yappi
+    yappi.stop()
+    stats = yappi.get_func_stats().sort("ttot")
+    terminalreporter.section("yappi wall-clock profile (top 25 by total time)")
+    for stat in list(stats)[:25]:
+        terminalreporter.write_line(f"{stat.ttot:9.3f}s {stat.ncall:8d}  {stat.full_name}")
+
+
+@pytest.fixture(scope="session")
+async def asgi_client():
+    """Return a factory giving the session's AsyncClient for an ASGI app"""
+    clients = {}
+    
+    async with AsyncExitStack() as stack:
+        async def client_for(app):
+            if app not in clients:
+                await stack.enter_async_context(app.router.lifespan_context(app))
+                transport = ASGITransport(app=app)
+                clients[app] = await stack.enter_async_context(
+                    AsyncClient(transport=transport, base_url="http://test")
+                )
+            return clients[app]
+        
+        yield client_for
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Pin each test class to a single xdist worker.
+    
+    With `pytest -n auto --dist=loadgroup`, tests in the same xdist_group run
+    on one worker, so each app's client, lifespan and SQLite file stay in
+    one process while the classes themselves run in parallel.
+    """
+    for item in items:
+        if item.cls is not None:
+            item.add_marker(pytest.mark.xdist_group(name=item.cls.__name__))
@@ -32,16 +32,29 @@ backlog = 2048
 # Worker Processes
 # ============================================================================
 
+# CPU count, read once and reused by every worker-count formula below.
+# sched_getaffinity only counts the CPUs this process may run on (e.g. a
+# container pinned to a cpuset) rather than every CPU on the host; it is
+# Linux-only, so fall back to the host count elsewhere.
+try:
+    _CPU = len(os.sched_getaffinity(0))
+except AttributeError:
+    _CPU = multiprocessing.cpu_count()
+
 # The number of worker processes for handling requests
 # Formula: (2 x $num_cores) + 1
-workers = multiprocessing.cpu_count() * 2 + 1
+workers = _CPU * 2 + 1
 
 # The type of workers to use
-# For FastAPI, use Uvicorn workers (ASGI)
-worker_class = "uvicorn.workers.UvicornWorker"
+# For FastAPI, use Uvicorn workers (ASGI). UvloopWorker (uvloop_worker.py) is
+# a UvicornWorker pinned to the uvloop event loop and httptools parser
+# instead of uvicorn's "auto" detection.
+worker_class = "uvloop_worker.UvloopWorker"
 
 # The maximum number of simultaneous clients (per worker)
-worker_connections = 1000
+# Note: only gunicorn's own async workers (gevent/eventlet) read this;
+# Uvicorn workers handle many idle connections cheaply and don't cap them.
+worker_connections = 4096
 
 # Workers silent for more than this many seconds are killed and restarted
 timeout = 30
@@ -52,7 +65,9 @@ timeout = 30
 graceful_timeout = 10
 
 # The number of seconds to wait for requests on a Keep-Alive connection
-keepalive = 5
+# Passed to Uvicorn as timeout_keep_alive. Kept short so idle clients free
+# their sockets quickly for new ones.
+keepalive = 2
 
 
 # ============================================================================
@@ -156,33 +171,32 @@ tmp_upload_dir = None
 # Server Hooks
 # ============================================================================
 
+# Hooks log through gunicorn's own logger (errorlog/loglevel above) rather
+# than print(), which writes to stdout synchronously on the fork path.
+
 def on_starting(server):
     """
     Called just before the master process is initialized.
     """
-    print("="*70)
-    print("🚀 Gunicorn + Uvicorn Starting")
-    print("="*70)
-    print(f"Workers: {workers}")
-    print(f"Bind: {bind}")
-    print(f"Worker class: {worker_class}")
-    print(f"Timeout: {timeout}s")
-    print("="*70)
+    server.log.info(
+        "Gunicorn + Uvicorn starting: workers=%s bind=%s worker_class=%s timeout=%ss",
+        server.cfg.workers, server.cfg.bind, server.cfg.worker_class_str,
+        server.cfg.timeout
+    )
 
 
 def on_reload(server):
     """
     Called to recycle workers during a reload via SIGHUP.
     """
-    print("🔄 Reloading workers...")
+    server.log.info("Reloading workers")
 
 
 def when_ready(server):
     """
     Called just after the server is started.
     """
-    print("✅ Server is ready to handle requests")
-    print("="*70)
+    server.log.info("Server is ready to handle requests")
 
 
 def pre_fork(server, worker):
@@ -196,28 +210,29 @@ def post_fork(server, worker):
     """
     Called just after a worker has been forked.
     """
-    print(f"👷 Worker {worker.pid} spawned")
+    if environment != "production":
+        server.log.info("Worker %s spawned", worker.pid)
 
 
 def pre_exec(server):
     """
     Called just before a new master process is forked.
     """
-    print("🔧 Forking new master process")
+    server.log.info("Forking new master process")
 
 
 def worker_int(worker):
     """
     Called when a worker receives the SIGINT or SIGQUIT signal.
     """
-    print(f"⚠️  Worker {worker.pid} received SIGINT/SIGQUIT")
+    worker.log.info("Worker %s received SIGINT/SIGQUIT", worker.pid)
 
 
 def worker_abort(worker):
     """
     Called when a worker receives the SIGABRT signal.
     """
-    print(f"💥 Worker {worker.pid} received SIGABRT")
+    worker.log.warning("Worker %s received SIGABRT", worker.pid)
 
 
 def pre_request(worker, req):
@@ -242,16 +257,14 @@ def worker_exit(server, worker):
     """
     Called just after a worker has been exited.
     """
-    print(f"👋 Worker {worker.pid} exited")
+    server.log.info("Worker %s exited", worker.pid)
 
 
 def on_exit(server):
     """
     Called just before the master process exits.
     """
-    print("="*70)
-    print("👋 Gunicorn shutting down")
-    print("="*70)
+    server.log.info("Gunicorn shutting down")
 
 
 # ============================================================================
@@ -278,25 +291,38 @@ def on_exit(server):
 # Environment-Specific Configuration
 # ============================================================================
 
-# You can override settings based on environment
+# Per-environment overrides of the settings above, applied in one lookup
+_ENV_SETTINGS = {
+    "development": {
+        "workers": 2,
+        "loglevel": "debug",
+        "reload": True,
+    },
+    "staging": {
+        "workers": _CPU + 1,
+        "loglevel": "info",
+    },
+    # Production uses the settings defined above
+    "production": {},
+}
+
 environment = os.getenv("ENVIRONMENT", "production")
 
-if environment == "development":
-    # Development settings
-    workers = 2
-    loglevel = "debug"
-    reload = True
-    print("⚙️  Running in DEVELOPMENT mode")
-
-elif environment == "staging":
-    # Staging settings
-    workers = multiprocessing.cpu_count() + 1
-    loglevel = "info"
-    print("⚙️  Running in STAGING mode")
-
-elif environment == "production":
-    # Production settings (already set above)
-    print("⚙️  Running in PRODUCTION mode")
+if environment in _ENV_SETTINGS:
+    globals().update(_ENV_SETTINGS[environment])
+    print(f"⚙️  Running in {environment.upper()} mode")
+
+# An explicit worker count wins over every formula above. CPU quotas (e.g. a
+# Kubernetes limit of 500m) don't show up in the CPU count, so set this to
+# size workers for a quota-limited pod.
+if os.getenv("GUNICORN_WORKERS"):
+    workers = int(os.environ["GUNICORN_WORKERS"])
+
+if environment == "production":
+    # Drop the chatty lifecycle hooks so gunicorn falls back to its built-in
+    # no-ops; it already logs worker boots and exits on its own. worker_abort
+    # stays (it's a real problem).
+    del on_starting, on_reload, when_ready, pre_exec, post_fork, worker_int, worker_exit, on_exit
 
 
 # ============================================================================
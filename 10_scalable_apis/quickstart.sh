@@ -39,7 +39,7 @@ echo ""
 # Install dependencies
 echo -e "${BLUE}Installing dependencies...${NC}"
 pip install --upgrade pip -q
-pip install fastapi uvicorn[standard] httpx aiosqlite psutil gunicorn pytest pytest-asyncio -q
+pip install fastapi uvicorn[standard] httpx aiosqlite psutil orjson gunicorn pytest pytest-asyncio pytest-xdist -q
 echo "✓ Dependencies installed"
 echo ""
 
@@ -0,0 +1,25 @@
+"""
+Gunicorn Worker Pinned to uvloop + httptools
+============================================
+
+The stock uvicorn.workers.UvicornWorker chooses the event loop and HTTP
+parser with "auto", silently falling back to asyncio and h11 when uvloop
+or httptools (both shipped with uvicorn[standard]) are missing. This
+worker pins them, so a broken install fails at boot instead of running
+on the slower pure-Python stack.
+
+Usage:
+    gunicorn 10_production_deployment:app -c gunicorn.conf.py
+    # or
+    gunicorn 10_production_deployment:app -k uvloop_worker.UvloopWorker
+"""
+
+from uvicorn.workers import UvicornWorker
+
+
+class UvloopWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        **UvicornWorker.CONFIG_KWARGS,
+        "loop": "uvloop",
+        "http": "httptools",
+    }
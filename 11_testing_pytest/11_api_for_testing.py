@@ -11,24 +11,37 @@ This API is used as the subject for testing examples in test_testing_basics.py
 
 Run the API:
     uvicorn 11_api_for_testing:app --reload
+
+Run with several worker processes (each keeps its own in-memory data):
+    WORKERS=9 python 11_api_for_testing.py
 """
 
 from fastapi import FastAPI, Depends, HTTPException, status, Header
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List, Dict
+from collections import Counter, defaultdict
 from datetime import datetime
+import itertools
+import orjson
+import os
 import sqlite3
+import time
 
 # ==================== FastAPI App ====================
 
 app = FastAPI(
     title="Testing Example API",
     description="Sample API for demonstrating testing techniques",
-    version="1.0.0"
+    version="1.0.0",
+    # Encode every JSON response with orjson instead of stdlib json
+    default_response_class=ORJSONResponse
 )
 
-security = HTTPBearer()
+# Compress large bodies (the list endpoints grow with the data); anything
+# under 1 KB, like /convert or /health, is sent as-is
+app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=5)
 
 # ==================== In-Memory Databases ====================
 
@@ -43,6 +56,21 @@ products_db: Dict[int, dict] = {
     2: {"id": 2, "name": "Mouse", "price": 29.99, "stock": 50},
 }
 
+# Users per role, kept current on insert/delete so stats never scan users_db
+role_counts: Counter = Counter(u["role"] for u in users_db.values())
+
+# ID sequences: O(1) per insert instead of max() over every key
+_user_ids = itertools.count(max(users_db, default=0) + 1)
+_product_ids = itertools.count(max(products_db, default=0) + 1)
+_order_ids = itertools.count(1)
+
+def _next_id(ids: itertools.count, table: dict) -> int:
+    """Next ID from the sequence, skipping any a (possibly overridden) table holds"""
+    new_id = next(ids)
+    while new_id in table:
+        new_id = next(ids)
+    return new_id
+
 # ==================== Pydantic Models ====================
 
 class User(BaseModel):
@@ -82,40 +110,64 @@ class Order(BaseModel):
 
 # ==================== Dependencies ====================
 
-def get_database():
+_database = {"users": users_db, "products": products_db}
+
+async def get_database():
     """
     Database dependency (simulated)
     This will be overridden in tests
+
+    Declared async so FastAPI calls it on the event loop instead of
+    dispatching a plain function to the threadpool on every request.
     """
-    return {"users": users_db, "products": products_db}
+    return _database
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+async def get_current_user(
+    authorization: Optional[str] = Header(None),
     db: dict = Depends(get_database)
 ) -> User:
     """
     Verify token and return current user
     In tests, this can be overridden to bypass authentication
+
+    Parses the Authorization header directly rather than going through
+    HTTPBearer, which builds a credentials object on every request.
     """
-    token = credentials.credentials
+    scheme, _, token = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
     
-    # Simple token validation (user_id as token)
-    try:
-        user_id = int(token)
-        user_data = db["users"].get(user_id)
-        if not user_data:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials"
-            )
-        return User(**user_data)
-    except (ValueError, KeyError):
+    # Simple token validation (user_id as token). Checking the digits up
+    # front keeps bad tokens off the exception path; the length cap matters
+    # too, since int() raises ValueError past 4300 digits and a user ID
+    # never needs more than 18.
+    if len(token) > 18 or not token.isdecimal():
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token format"
         )
+    user_id = int(token)
+    users = db["users"]
+    if users is users_db:
+        user = _user_models.get(user_id)
+        if user is not None:
+            return user
+    user_data = users.get(user_id)
+    if not user_data:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials"
+        )
+    user = User(**user_data)
+    if users is users_db:
+        _user_models[user_id] = user
+    return user
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
     """
     Require admin role
     Can be overridden in tests
@@ -127,36 +179,82 @@ def require_admin(current_user: User = Depends(get_current_user)) -> User:
         )
     return current_user
 
+# ==================== Response Caches ====================
+
+# Encoded list bodies for the real tables. Built on the first read after a
+# write, so validation runs once per change instead of once per request.
+# Handlers that write users_db/products_db reset the matching cache to None.
+_users_cache: Optional[bytes] = None
+_products_cache: Optional[bytes] = None
+
+# Validated User models for users_db rows, built on first authentication so
+# later requests with the same token skip validation. delete_user evicts.
+_user_models: Dict[int, User] = {}
+
+def _encode_list(model, rows) -> bytes:
+    """Validate rows through model and encode them as a JSON array"""
+    return orjson.dumps([model(**row).model_dump() for row in rows])
+
 # ==================== API Endpoints ====================
 
+# Read endpoints document their schema with responses={200: {"model": ...}}
+# rather than response_model: rows were validated on the way in, so they are
+# returned as-is instead of being validated a second time on the way out.
+
+# Static payloads: encoded once at import, served as raw bytes
+_ROOT_BYTES = orjson.dumps({"message": "Welcome to Testing Example API", "status": "ok"})
+
+# Everything in the health body but the timestamp is fixed, so only the
+# timestamp is formatted per request and spliced between these two halves
+_HEALTH_HEAD = b'{"status":"healthy","version":"1.0.0","timestamp":"'
+_HEALTH_TAIL = b'"}'
+
+# Health timestamps have one-second resolution: the formatted value is reused
+# until the wall-clock second changes, so most requests skip the formatting
+_stamp_second = -1
+_stamp_bytes = b""
+
+def _utc_stamp() -> bytes:
+    """Current UTC time as encoded ISO-8601, reformatted at most once a second"""
+    global _stamp_second, _stamp_bytes
+    second = int(time.time())
+    if second != _stamp_second:
+        _stamp_bytes = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)).encode()
+        _stamp_second = second
+    return _stamp_bytes
+
 @app.get("/")
-def root():
+async def root():
     """Simple endpoint for basic testing"""
-    return {"message": "Welcome to Testing Example API", "status": "ok"}
+    return Response(content=_ROOT_BYTES, media_type="application/json")
 
 @app.get("/health")
-def health_check():
+async def health_check():
     """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
-    }
+    return Response(
+        content=_HEALTH_HEAD + _utc_stamp() + _HEALTH_TAIL,
+        media_type="application/json"
+    )
 
 # ==================== User Endpoints ====================
 
-@app.get("/users", response_model=List[User])
-def list_users(db: dict = Depends(get_database)):
+@app.get("/users", responses={200: {"model": List[User]}})
+async def list_users(db: dict = Depends(get_database)):
     """Get all users"""
-    return list(db["users"].values())
+    global _users_cache
+    if db["users"] is not users_db:
+        return Response(_encode_list(User, db["users"].values()), media_type="application/json")
+    if _users_cache is None:
+        _users_cache = _encode_list(User, users_db.values())
+    return Response(_users_cache, media_type="application/json")
 
 @app.get("/users/me", response_model=User)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user)):
     """Get current authenticated user"""
     return current_user
 
-@app.get("/users/{user_id}", response_model=User)
-def get_user(user_id: int, db: dict = Depends(get_database)):
+@app.get("/users/{user_id}", responses={200: {"model": User}})
+async def get_user(user_id: int, db: dict = Depends(get_database)):
     """Get user by ID"""
     user = db["users"].get(user_id)
     if not user:
@@ -164,30 +262,59 @@ def get_user(user_id: int, db: dict = Depends(get_database)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"User {user_id} not found"
         )
-    return User(**user)
+    return ORJSONResponse(user)
 
 @app.post("/users", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_user(
+async def create_user(
     user: UserCreate,
     db: dict = Depends(get_database),
     admin: User = Depends(require_admin)  # Requires admin
 ):
     """Create new user (admin only)"""
-    new_id = max(db["users"].keys()) + 1 if db["users"] else 1
+    global _users_cache
+    new_id = _next_id(_user_ids, db["users"])
     user_data = user.model_dump()
     user_data["id"] = new_id
     db["users"][new_id] = user_data
+    if db["users"] is users_db:
+        role_counts[user_data["role"]] += 1
+        _users_cache = None
     return User(**user_data)
 
+@app.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_user(
+    user_id: int,
+    db: dict = Depends(get_database),
+    admin: User = Depends(require_admin)  # Requires admin
+):
+    """Delete user (admin only)"""
+    global _users_cache
+    user = db["users"].pop(user_id, None)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User {user_id} not found"
+        )
+    if db["users"] is users_db:
+        role_counts[user["role"]] -= 1
+        _user_models.pop(user_id, None)
+        _users_cache = None
+    return None
+
 # ==================== Product Endpoints ====================
 
-@app.get("/products", response_model=List[Product])
-def list_products(db: dict = Depends(get_database)):
+@app.get("/products", responses={200: {"model": List[Product]}})
+async def list_products(db: dict = Depends(get_database)):
     """Get all products"""
-    return list(db["products"].values())
-
-@app.get("/products/{product_id}", response_model=Product)
-def get_product(product_id: int, db: dict = Depends(get_database)):
+    global _products_cache
+    if db["products"] is not products_db:
+        return Response(_encode_list(Product, db["products"].values()), media_type="application/json")
+    if _products_cache is None:
+        _products_cache = _encode_list(Product, products_db.values())
+    return Response(_products_cache, media_type="application/json")
+
+@app.get("/products/{product_id}", responses={200: {"model": Product}})
+async def get_product(product_id: int, db: dict = Depends(get_database)):
     """Get product by ID"""
     product = db["products"].get(product_id)
     if not product:
@@ -195,47 +322,75 @@ def get_product(product_id: int, db: dict = Depends(get_database)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product {product_id} not found"
         )
-    return Product(**product)
+    return ORJSONResponse(product)
 
 @app.post("/products", response_model=Product, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     product: ProductCreate,
     db: dict = Depends(get_database),
     admin: User = Depends(require_admin)  # Requires admin
 ):
     """Create new product (admin only)"""
-    new_id = max(db["products"].keys()) + 1 if db["products"] else 1
+    global _products_cache
+    new_id = _next_id(_product_ids, db["products"])
     product_data = product.model_dump()
     product_data["id"] = new_id
     db["products"][new_id] = product_data
+    if db["products"] is products_db:
+        _products_cache = None
     return Product(**product_data)
 
 @app.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(
+async def delete_product(
     product_id: int,
     db: dict = Depends(get_database),
     admin: User = Depends(require_admin)  # Requires admin
 ):
     """Delete product (admin only)"""
+    global _products_cache
     if product_id not in db["products"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product {product_id} not found"
         )
     del db["products"][product_id]
+    if db["products"] is products_db:
+        _products_cache = None
     return None
 
 # ==================== Order Endpoints ====================
 
 orders_db: List[dict] = []
 
+def _take_stock(product: dict, quantity: int) -> Optional[int]:
+    """
+    Decrement product stock by quantity if enough is available.
+    Returns None on success, or the available stock if there isn't enough.
+
+    Deliberately synchronous: with no await between the check and the
+    decrement, no other request can run in between on the event loop, so
+    concurrent orders can't oversell. Keep it that way rather than adding
+    awaits here.
+    """
+    available = product["stock"]
+    if available < quantity:
+        return available
+    product["stock"] = available - quantity
+    return None
+
+# Append-only indexes into orders_db: list positions per user / product, so a
+# filtered view costs O(that user's orders) instead of a scan of every order
+orders_by_user: Dict[int, List[int]] = defaultdict(list)
+orders_by_product: Dict[int, List[int]] = defaultdict(list)
+
 @app.post("/orders", response_model=Order, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     order: OrderCreate,
     db: dict = Depends(get_database),
     current_user: User = Depends(get_current_user)
 ):
     """Create new order"""
+    global _products_cache
     # Verify user exists
     if order.user_id not in db["users"]:
         raise HTTPException(
@@ -251,21 +406,22 @@ def create_order(
             detail=f"Product {order.product_id} not found"
         )
     
-    # Check stock
-    if product["stock"] < order.quantity:
+    # Check and update stock in one step
+    available = _take_stock(product, order.quantity)
+    if available is not None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Insufficient stock. Available: {product['stock']}"
+            detail=f"Insufficient stock. Available: {available}"
         )
     
     # Calculate total
     total_price = product["price"] * order.quantity
     
-    # Update stock
-    product["stock"] -= order.quantity
+    if db["products"] is products_db:
+        _products_cache = None
     
     # Create order
-    order_id = len(orders_db) + 1
+    order_id = next(_order_ids)
     order_data = {
         "id": order_id,
         "user_id": order.user_id,
@@ -274,37 +430,49 @@ def create_order(
         "total_price": total_price,
         "created_at": datetime.utcnow()
     }
+    position = len(orders_db)
     orders_db.append(order_data)
+    orders_by_user[order.user_id].append(position)
+    orders_by_product[order.product_id].append(position)
     
     return Order(**order_data)
 
 @app.get("/orders", response_model=List[Order])
-def list_orders(current_user: User = Depends(get_current_user)):
+async def list_orders(current_user: User = Depends(get_current_user)):
     """Get all orders (authenticated users only)"""
     return orders_db
 
+@app.get("/orders/me", response_model=List[Order])
+async def list_my_orders(current_user: User = Depends(get_current_user)):
+    """Get the current user's orders"""
+    return [orders_db[i] for i in orders_by_user.get(current_user.id, ())]
+
 # ==================== External Service Simulation ====================
 
-def get_external_api_client():
+# Rates the simulated service knows about, built once instead of per call
+_RATES: Dict[tuple, float] = {
+    ("USD", "EUR"): 0.85,
+    ("USD", "GBP"): 0.73,
+    ("EUR", "USD"): 1.18,
+}
+
+class ExternalAPIClient:
+    def get_exchange_rate(self, from_currency: str, to_currency: str) -> float:
+        """Simulates calling external API"""
+        # In real app, this would call external service
+        return _RATES.get((from_currency, to_currency), 1.0)
+
+_external_api_client = ExternalAPIClient()
+
+async def get_external_api_client():
     """
     Simulates external API dependency
     Will be mocked in tests
     """
-    class ExternalAPIClient:
-        def get_exchange_rate(self, from_currency: str, to_currency: str) -> float:
-            """Simulates calling external API"""
-            # In real app, this would call external service
-            rates = {
-                ("USD", "EUR"): 0.85,
-                ("USD", "GBP"): 0.73,
-                ("EUR", "USD"): 1.18,
-            }
-            return rates.get((from_currency, to_currency), 1.0)
-    
-    return ExternalAPIClient()
+    return _external_api_client
 
 @app.get("/convert/{amount}")
-def convert_currency(
+async def convert_currency(
     amount: float,
     from_currency: str = "USD",
     to_currency: str = "EUR",
@@ -361,7 +529,7 @@ def get_db_connection():
         db.disconnect()
 
 @app.get("/stats/users")
-def get_user_stats(db: DatabaseConnection = Depends(get_db_connection)):
+async def get_user_stats(db: DatabaseConnection = Depends(get_db_connection)):
     """
     Get user statistics
     Demonstrates testing with database mocking
@@ -371,8 +539,8 @@ def get_user_stats(db: DatabaseConnection = Depends(get_db_connection)):
     return {
         "total_users": len(users_db),
         "roles": {
-            "admin": sum(1 for u in users_db.values() if u["role"] == "admin"),
-            "user": sum(1 for u in users_db.values() if u["role"] == "user"),
+            "admin": role_counts["admin"],
+            "user": role_counts["user"],
         }
     }
 
@@ -382,4 +550,22 @@ if __name__ == "__main__":
     import uvicorn
     print("🧪 Starting Testing Example API...")
     print("📖 Docs available at: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Each worker is a separate process with its own users_db/products_db/
+    # orders_db, so writes made through one worker are invisible to the
+    # others. Keep the default of 1 for functional use; for read-only load
+    # tests set WORKERS (e.g. to 2 x CPU + 1) to use every core.
+    workers = int(os.getenv("WORKERS", "1"))
+    # uvloop event loop + httptools parser (both ship with uvicorn[standard]).
+    # Multiple workers need the app as an import string, not the instance.
+    uvicorn.run(
+        "11_api_for_testing:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        # One synchronous log line per request is costly under load; set
+        # ACCESS_LOG=1 and/or LOG_LEVEL=info to see requests while debugging
+        access_log=os.getenv("ACCESS_LOG", "0") == "1",
+        log_level=os.getenv("LOG_LEVEL", "warning")
+    )
@@ -0,0 +1,74 @@
+"""
+Shared pytest fixtures for the testing examples
+===============================================
+Loads 11_api_for_testing.py (its name starts with a digit, so it can't be
+imported directly) and provides one TestClient for the whole session.
+"""
+
+import importlib.util
+import pathlib
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+def load_api_module():
+    """
+    Load 11_api_for_testing.py as "api_for_testing", at most once per process
+    Later calls (another conftest, a re-imported test file) get the cached
+    module instead of rebuilding the app.
+    """
+    if "api_for_testing" in sys.modules:
+        return sys.modules["api_for_testing"]
+    spec = importlib.util.spec_from_file_location(
+        "api_for_testing",
+        pathlib.Path(__file__).with_name("11_api_for_testing.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["api_for_testing"] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Loaded at conftest import so test files can `from api_for_testing import ...`
+# FastAPI never rebinds app.dependency_overrides, so the fixtures below hold
+# the dict itself rather than looking it up through the app on every use
+_overrides = load_api_module().app.dependency_overrides
+
+# Pydantic builds the User validator when the class is defined, but the first
+# EmailStr check still lazily imports email-validator's IDNA tables (~5 ms).
+# Validate one throwaway user now so that cost lands in collection instead of
+# inside whichever test happens to run first.
+load_api_module().User(id=0, name="warmup", email="warmup@example.com")
+
+
+@pytest.fixture(scope="session")
+def api_module():
+    """The loaded API module, shared by the whole session"""
+    return load_api_module()
+
+@pytest.fixture(scope="session")
+def client(api_module):
+    """
+    Session-wide TestClient
+    Entering it once starts the app's event-loop portal and lifespan a single
+    time, instead of TestClient spinning a portal up for every request.
+    """
+    with TestClient(api_module.app) as c:
+        yield c
+
+
+@pytest.fixture(autouse=True)
+def _clear_overrides():
+    """Drop every dependency override after each test, pass or fail"""
+    yield
+    _overrides.clear()
+
+@pytest.fixture
+def override():
+    """
+    Install a dependency override for the current test:
+        override(get_database, lambda: mock_db)
+    No cleanup needed; _clear_overrides removes it afterwards.
+    """
+    return _overrides.__setitem__
@@ -163,6 +163,7 @@ while true; do
             echo "  pytest test_testing_basics.py -v           # Verbose output"
             echo "  pytest test_testing_basics.py -s           # Show print statements"
             echo "  pytest test_testing_basics.py -x           # Stop on first failure"
+            echo "  pytest -q --no-header --tb=line            # Minimal output, quick reruns"
             echo ""
             echo -e "${YELLOW}Specific Tests:${NC}"
             echo "  pytest test_testing_basics.py::test_root   # Run one test"
@@ -23,40 +23,27 @@ Run with output:
 """
 
 import pytest
-from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-import importlib.util
-import sys
+from types import MappingProxyType
+import httpx
 
 # ==================== Import Module ====================
 
-# Import module with number prefix
-spec = importlib.util.spec_from_file_location(
-    "api_for_testing", 
-    "11_api_for_testing.py"
+# conftest.py loads 11_api_for_testing.py under this name (the file name
+# starts with a digit) and provides the session-wide `client` fixture
+from api_for_testing import (
+    app,
+    get_database,
+    get_current_user,
+    require_admin,
+    get_external_api_client,
+    get_db_connection,
+    User,
 )
-api_module = importlib.util.module_from_spec(spec)
-sys.modules["api_for_testing"] = api_module
-spec.loader.exec_module(api_module)
-
-# Import from loaded module
-app = api_module.app
-get_database = api_module.get_database
-get_current_user = api_module.get_current_user
-require_admin = api_module.require_admin
-get_external_api_client = api_module.get_external_api_client
-get_db_connection = api_module.get_db_connection
-User = api_module.User
-DatabaseConnection = api_module.DatabaseConnection
-
-# ==================== Test Client Setup ====================
-
-client = TestClient(app)
 
 # ==================== PART 1: Basic TestClient Usage ====================
 
-def test_root():
+def test_root(client):
     """Test simple GET endpoint"""
     response = client.get("/")
     
@@ -66,7 +53,7 @@ def test_root():
         "status": "ok"
     }
 
-def test_health_check():
+def test_health_check(client):
     """Test health check endpoint"""
     response = client.get("/health")
     
@@ -76,7 +63,7 @@ def test_health_check():
     assert "timestamp" in data
     assert data["version"] == "1.0.0"
 
-def test_list_users():
+def test_list_users(client):
     """Test listing users"""
     response = client.get("/users")
     
@@ -85,7 +72,7 @@ def test_list_users():
     assert len(users) >= 2  # At least Alice and Bob
     assert any(u["name"] == "Alice" for u in users)
 
-def test_get_user_success():
+def test_get_user_success(client):
     """Test getting existing user"""
     response = client.get("/users/1")
     
@@ -94,14 +81,14 @@ def test_get_user_success():
     assert user["name"] == "Alice"
     assert user["email"] == "alice@example.com"
 
-def test_get_user_not_found():
+def test_get_user_not_found(client):
     """Test getting non-existent user returns 404"""
     response = client.get("/users/999")
     
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()
 
-def test_list_products():
+def test_list_products(client):
     """Test listing products"""
     response = client.get("/products")
     
@@ -112,37 +99,45 @@ def test_list_products():
 
 # ==================== PART 2: Testing with Headers and Authentication ====================
 
-def test_get_current_user_without_auth():
+# Tokens are user IDs (simplified auth); shared header dicts, never mutated
+AUTH_ALICE = {"Authorization": "Bearer 1"}  # Alice is admin
+AUTH_BOB = {"Authorization": "Bearer 2"}  # Bob is not admin
+AUTH_INVALID = {"Authorization": "Bearer invalid"}
+
+def test_get_current_user_without_auth(client):
     """Test protected endpoint without authentication"""
     response = client.get("/users/me")
     
-    # Should return 401 because HTTPBearer security requires auth header
+    # Should return 401 because the endpoint requires a Bearer token
     assert response.status_code == 401
 
-def test_get_current_user_with_valid_token():
+def test_get_current_user_with_valid_token(client):
     """Test protected endpoint with valid authentication"""
     # Use user_id as token (simplified auth)
-    headers = {"Authorization": "Bearer 1"}  
-    response = client.get("/users/me", headers=headers)
+    response = client.get("/users/me", headers=AUTH_ALICE)
     
     assert response.status_code == 200
     user = response.json()
     assert user["name"] == "Alice"
 
-def test_get_current_user_with_invalid_token():
+def test_get_current_user_with_invalid_token(client):
     """Test protected endpoint with invalid token"""
-    headers = {"Authorization": "Bearer invalid"}
-    response = client.get("/users/me", headers=headers)
+    response = client.get("/users/me", headers=AUTH_INVALID)
     
     assert response.status_code == 401
 
-def test_create_product_without_admin():
+def test_get_current_user_with_oversized_token(client):
+    """An all-digit token too long for int() is rejected, not a 500"""
+    response = client.get("/users/me", headers={"Authorization": "Bearer " + "9" * 5000})
+    
+    assert response.status_code == 401
+
+def test_create_product_without_admin(client):
     """Test admin endpoint without admin role"""
-    headers = {"Authorization": "Bearer 2"}  # Bob is not admin
     response = client.post(
         "/products",
         json={"name": "Keyboard", "price": 59.99, "stock": 20},
-        headers=headers
+        headers=AUTH_BOB
     )
     
     assert response.status_code == 403
@@ -150,70 +145,68 @@ def test_create_product_without_admin():
 
 # ==================== PART 3: Dependency Override - Mock Database ====================
 
+# Read-only test databases: built once at import and wrapped in
+# MappingProxyType so a test that tries to write to them fails loudly.
+# Rows stay plain dicts because the endpoints serialize them directly.
+MOCK_DB = MappingProxyType({
+    "users": MappingProxyType({
+        1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"},
+        2: {"id": 2, "name": "Test Admin", "email": "admin@example.com", "role": "admin"},
+    }),
+    "products": MappingProxyType({
+        1: {"id": 1, "name": "Test Product", "price": 99.99, "stock": 5},
+    }),
+})
+
+ISOLATED_DB = MappingProxyType({
+    "users": MappingProxyType({
+        100: {"id": 100, "name": "Isolated User", "email": "isolated@example.com", "role": "admin"}
+    }),
+    "products": MappingProxyType({}),
+})
+
 @pytest.fixture
 def mock_db():
-    """Create a mock database for testing"""
-    return {
-        "users": {
-            1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"},
-            2: {"id": 2, "name": "Test Admin", "email": "admin@example.com", "role": "admin"},
-        },
-        "products": {
-            1: {"id": 1, "name": "Test Product", "price": 99.99, "stock": 5},
-        }
-    }
+    """Mock database for testing (read-only, so shared rather than rebuilt)"""
+    return MOCK_DB
 
-def test_with_database_override(mock_db):
+def test_with_database_override(mock_db, client, override):
     """
     Test with dependency override - replace database
     This demonstrates how to override dependencies in tests
     """
     
     # Override the get_database dependency
-    app.dependency_overrides[get_database] = lambda: mock_db
-    
-    try:
-        # Now requests will use mock_db
-        response = client.get("/users")
-        
-        assert response.status_code == 200
-        users = response.json()
-        assert len(users) == 2
-        assert users[0]["name"] == "Test User"
-        
-        # Test product with mock data
-        response = client.get("/products/1")
-        assert response.status_code == 200
-        assert response.json()["name"] == "Test Product"
-        
-    finally:
-        # Clear overrides after test
-        app.dependency_overrides.clear()
-
-def test_isolated_database():
+    override(get_database, lambda: mock_db)
+    
+    # Now requests will use mock_db
+    response = client.get("/users")
+    
+    assert response.status_code == 200
+    users = response.json()
+    assert len(users) == 2
+    assert users[0]["name"] == "Test User"
+    
+    # Test product with mock data
+    response = client.get("/products/1")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Test Product"
+
+def test_isolated_database(client, override):
     """
     Test with isolated database to avoid side effects
-    Each test gets its own database
+    The test sees only its own (read-only) database, never the real one
     """
-    isolated_db = {
-        "users": {
-            100: {"id": 100, "name": "Isolated User", "email": "isolated@example.com", "role": "admin"}
-        },
-        "products": {}
-    }
-    
-    app.dependency_overrides[get_database] = lambda: isolated_db
+    override(get_database, lambda: ISOLATED_DB)
     
-    try:
-        response = client.get("/users")
-        assert len(response.json()) == 1
-        assert response.json()[0]["name"] == "Isolated User"
-    finally:
-        app.dependency_overrides.clear()
+    response = client.get("/users")
+    users = response.json()
+    assert len(users) == 1
+    assert users[0]["name"] == "Isolated User"
 
 # ==================== PART 4: Dependency Override - Bypass Authentication ====================
 
-def test_bypass_authentication():
+def test_bypass_authentication(client, override):
     """
     Override authentication dependency to bypass auth in tests
     Useful for testing endpoints without dealing with tokens
@@ -223,21 +216,17 @@ def test_bypass_authentication():
     mock_user = User(id=99, name="Mock User", email="mock@example.com", role="user")
     
     # Override authentication dependency
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    
-    try:
-        # Access protected endpoint without Authorization header
-        response = client.get("/users/me")
-        
-        assert response.status_code == 200
-        user = response.json()
-        assert user["name"] == "Mock User"
-        assert user["id"] == 99
-        
-    finally:
-        app.dependency_overrides.clear()
-
-def test_bypass_admin_check():
+    override(get_current_user, lambda: mock_user)
+    
+    # Access protected endpoint without Authorization header
+    response = client.get("/users/me")
+    
+    assert response.status_code == 200
+    user = response.json()
+    assert user["name"] == "Mock User"
+    assert user["id"] == 99
+
+def test_bypass_admin_check(client, override):
     """
     Override admin requirement to test admin endpoints
     """
@@ -246,127 +235,141 @@ def test_bypass_admin_check():
     mock_admin = User(id=88, name="Mock Admin", email="admin@example.com", role="admin")
     
     # Override both authentication dependencies
-    app.dependency_overrides[get_current_user] = lambda: mock_admin
-    app.dependency_overrides[require_admin] = lambda: mock_admin
-    
-    try:
-        # Create product without worrying about authentication
-        response = client.post(
-            "/products",
-            json={"name": "Test Product", "price": 49.99, "stock": 10}
-        )
-        
-        assert response.status_code == 201
-        product = response.json()
-        assert product["name"] == "Test Product"
-        
-    finally:
-        app.dependency_overrides.clear()
+    override(get_current_user, lambda: mock_admin)
+    override(require_admin, lambda: mock_admin)
+    
+    # Create product without worrying about authentication
+    response = client.post(
+        "/products",
+        json={"name": "Test Product", "price": 49.99, "stock": 10}
+    )
+    
+    assert response.status_code == 201
+    product = response.json()
+    assert product["name"] == "Test Product"
 
 # ==================== PART 5: Mocking External Services ====================
 
-def test_currency_conversion_with_mock():
+class FakeExchangeAPI:
+    """
+    Hand-rolled stand-in for the external API client
+    Returns the given rates in order, one per call, and records each call.
+    Much cheaper to build and call than a Mock, and just as easy to assert on.
+    """
+    
+    def __init__(self, rates):
+        self._rates = iter(rates)
+        self.calls = []
+    
+    def get_exchange_rate(self, from_currency: str, to_currency: str) -> float:
+        self.calls.append((from_currency, to_currency))
+        return next(self._rates)
+
+def test_currency_conversion_with_mock(client, override):
     """
     Test currency conversion with mocked external API
     Demonstrates mocking external service dependencies
     """
     
-    # Create mock API client
-    mock_api_client = Mock()
-    mock_api_client.get_exchange_rate.return_value = 1.5
+    # Create fake API client
+    mock_api_client = FakeExchangeAPI([1.5])
     
     # Override external API dependency
-    app.dependency_overrides[get_external_api_client] = lambda: mock_api_client
-    
-    try:
-        response = client.get("/convert/100?from_currency=USD&to_currency=EUR")
-        
-        assert response.status_code == 200
-        data = response.json()
-        assert data["amount"] == 100
-        assert data["rate"] == 1.5
-        assert data["converted"] == 150.0
-        
-        # Verify mock was called
-        mock_api_client.get_exchange_rate.assert_called_once_with("USD", "EUR")
-        
-    finally:
-        app.dependency_overrides.clear()
-
-def test_currency_conversion_multiple_rates():
+    override(get_external_api_client, lambda: mock_api_client)
+    
+    response = client.get("/convert/100?from_currency=USD&to_currency=EUR")
+    
+    assert response.status_code == 200
+    data = response.json()
+    assert data["amount"] == 100
+    assert data["rate"] == 1.5
+    assert data["converted"] == 150.0
+    
+    # Verify the fake was called
+    assert mock_api_client.calls == [("USD", "EUR")]
+
+def test_currency_conversion_multiple_rates(client, override):
     """
     Test multiple currency conversions with different mocked rates
     """
     
-    mock_api_client = Mock()
-    # Mock different rates for different calls
-    mock_api_client.get_exchange_rate.side_effect = [0.85, 0.73, 1.18]
-    
-    app.dependency_overrides[get_external_api_client] = lambda: mock_api_client
-    
-    try:
-        # First call
-        response = client.get("/convert/100?from_currency=USD&to_currency=EUR")
-        assert response.json()["rate"] == 0.85
-        
-        # Second call
-        response = client.get("/convert/100?from_currency=USD&to_currency=GBP")
-        assert response.json()["rate"] == 0.73
-        
-        # Third call
-        response = client.get("/convert/100?from_currency=EUR&to_currency=USD")
-        assert response.json()["rate"] == 1.18
-        
-    finally:
-        app.dependency_overrides.clear()
+    # Fake different rates for different calls
+    mock_api_client = FakeExchangeAPI([0.85, 0.73, 1.18])
+    
+    override(get_external_api_client, lambda: mock_api_client)
+    
+    # First call
+    response = client.get("/convert/100?from_currency=USD&to_currency=EUR")
+    assert response.json()["rate"] == 0.85
+    
+    # Second call
+    response = client.get("/convert/100?from_currency=USD&to_currency=GBP")
+    assert response.json()["rate"] == 0.73
+    
+    # Third call
+    response = client.get("/convert/100?from_currency=EUR&to_currency=USD")
+    assert response.json()["rate"] == 1.18
 
 # ==================== PART 6: Mocking Database Connections ====================
 
-def test_user_stats_with_mocked_db():
+class FakeDatabaseConnection:
+    """
+    Stand-in for DatabaseConnection that returns canned query results
+    Avoids Mock(spec=...), which introspects the real class on creation.
+    """
+    
+    def __init__(self, rows):
+        self._rows = rows
+    
+    def execute_query(self, query: str):
+        return self._rows
+
+def test_user_stats_with_mocked_db(client, override):
     """
     Test database query with mocked DB connection
     Demonstrates mocking database dependencies
     """
     
-    # Create mock database connection
-    mock_db_conn = Mock(spec=DatabaseConnection)
-    mock_db_conn.execute_query.return_value = [("users", 100), ("admins", 10)]
+    # Create fake database connection
+    mock_db_conn = FakeDatabaseConnection([("users", 100), ("admins", 10)])
     
     # Override database connection dependency
-    app.dependency_overrides[get_db_connection] = lambda: mock_db_conn
-    
-    try:
-        response = client.get("/stats/users")
-        
-        assert response.status_code == 200
-        stats = response.json()
-        # The endpoint doesn't actually use the mock query, but demonstrates pattern
-        assert "total_users" in stats
-        
-    finally:
-        app.dependency_overrides.clear()
+    override(get_db_connection, lambda: mock_db_conn)
+    
+    response = client.get("/stats/users")
+    
+    assert response.status_code == 200
+    stats = response.json()
+    # The endpoint doesn't actually use the mock query, but demonstrates pattern
+    assert "total_users" in stats
 
 # ==================== PART 7: Fixtures for Reusable Test Data ====================
 
-@pytest.fixture
+# The users are never mutated, so one instance serves the whole session
+
+@pytest.fixture(scope="session")
 def admin_user():
     """Fixture providing admin user"""
     return User(id=1, name="Admin", email="admin@example.com", role="admin")
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def regular_user():
     """Fixture providing regular user"""
     return User(id=2, name="User", email="user@example.com", role="user")
 
 @pytest.fixture
-def setup_admin_auth(admin_user):
+def setup_admin_auth(admin_user, override):
     """Fixture that sets up admin authentication"""
-    app.dependency_overrides[get_current_user] = lambda: admin_user
-    app.dependency_overrides[require_admin] = lambda: admin_user
-    yield
-    app.dependency_overrides.clear()
+    override(get_current_user, lambda: admin_user)
+    override(require_admin, lambda: admin_user)
 
-def test_create_user_with_fixture(setup_admin_auth):
+@pytest.fixture
+def auth_client(client, override, regular_user):
+    """The session client, with requests authenticated as regular_user"""
+    override(get_current_user, lambda: regular_user)
+    return client
+
+def test_create_user_with_fixture(setup_admin_auth, client):
     """
     Test using fixture for authentication setup
     Cleaner than manually managing overrides
@@ -380,15 +383,86 @@ def test_create_user_with_fixture(setup_admin_auth):
     user = response.json()
     assert user["name"] == "New User"
 
-def test_delete_product_with_fixture(setup_admin_auth):
-    """Test delete operation using auth fixture"""
-    # First get a product ID
-    response = client.get("/products")
-    if response.json():
-        product_id = response.json()[0]["id"]
-        
-        response = client.delete(f"/products/{product_id}")
-        assert response.status_code == 204
+@pytest.fixture
+def product_id(client):
+    """
+    ID of a throwaway product, created and removed through the API
+    Going through the endpoints keeps the cached product list in step;
+    leaves the seed products alone.
+    """
+    response = client.post(
+        "/products",
+        json={"name": "Disposable", "price": 1.0, "stock": 1},
+        headers=AUTH_ALICE
+    )
+    new_id = response.json()["id"]
+    yield new_id
+    # 404 if the test already deleted it; either way it's gone
+    client.delete(f"/products/{new_id}", headers=AUTH_ALICE)
+
+def test_delete_product_with_fixture(setup_admin_auth, product_id, client):
+    """Test delete operation using auth and product fixtures"""
+    response = client.delete(f"/products/{product_id}")
+    assert response.status_code == 204
+
+def test_product_ids_not_reused_after_delete(setup_admin_auth, client):
+    """IDs come from a sequence, so a deleted product's ID is never handed out again"""
+    product = {"name": "Temp Product", "price": 5.0, "stock": 1}
+    first_id = client.post("/products", json=product).json()["id"]
+    
+    response = client.delete(f"/products/{first_id}")
+    assert response.status_code == 204
+    
+    second_id = client.post("/products", json=product).json()["id"]
+    assert second_id > first_id
+
+def test_product_list_reflects_writes(setup_admin_auth, client):
+    """The cached /products body is rebuilt after a product is created"""
+    client.get("/products")  # warm the cache
+    
+    response = client.post(
+        "/products",
+        json={"name": "Cached Product", "price": 1.5, "stock": 3}
+    )
+    product_id = response.json()["id"]
+    
+    products = client.get("/products").json()
+    assert any(p["id"] == product_id for p in products)
+    
+    client.delete(f"/products/{product_id}")
+    products = client.get("/products").json()
+    assert not any(p["id"] == product_id for p in products)
+
+def test_user_stats_track_create_and_delete(setup_admin_auth, client):
+    """Role counts in /stats/users follow user creation and deletion"""
+    before = client.get("/stats/users").json()
+    
+    response = client.post(
+        "/users",
+        json={"name": "Temp User", "email": "temp@example.com", "role": "user"}
+    )
+    user_id = response.json()["id"]
+    created = client.get("/stats/users").json()
+    assert created["total_users"] == before["total_users"] + 1
+    assert created["roles"]["user"] == before["roles"]["user"] + 1
+    
+    response = client.delete(f"/users/{user_id}")
+    assert response.status_code == 204
+    assert client.get("/stats/users").json() == before
+
+def test_deleted_user_token_rejected(client):
+    """A token stops working once its user is deleted, even after it was used"""
+    response = client.post(
+        "/users",
+        json={"name": "Short Lived", "email": "short@example.com"},
+        headers=AUTH_ALICE
+    )
+    user_id = response.json()["id"]
+    token = {"Authorization": f"Bearer {user_id}"}
+    
+    assert client.get("/users/me", headers=token).status_code == 200
+    assert client.delete(f"/users/{user_id}", headers=AUTH_ALICE).status_code == 204
+    assert client.get("/users/me", headers=token).status_code == 401
 
 # ==================== PART 8: Parametrized Tests ====================
 
@@ -396,7 +470,7 @@ def test_delete_product_with_fixture(setup_admin_auth):
     (1, "Alice"),
     (2, "Bob"),
 ])
-def test_get_user_parametrized(user_id, expected_name):
+def test_get_user_parametrized(user_id, expected_name, client):
     """
     Test multiple users with parametrization
     Runs the test once for each parameter set
@@ -406,117 +480,97 @@ def test_get_user_parametrized(user_id, expected_name):
     assert response.status_code == 200
     assert response.json()["name"] == expected_name
 
-@pytest.mark.parametrize("endpoint", [
-    "/",
-    "/health",
-    "/users",
-    "/products",
+@pytest.mark.parametrize("endpoint,expected_status", [
+    # Public endpoints are accessible
+    ("/", 200),
+    ("/health", 200),
+    ("/users", 200),
+    ("/products", 200),
+    # Invalid user IDs are not found
+    ("/users/999", 404),
+    ("/users/0", 404),
+    ("/users/-1", 404),
+    ("/users/10000", 404),
+], ids=[
+    "root", "health", "users", "products",
+    "user-big", "user-zero", "user-neg", "user-huge",
 ])
-def test_public_endpoints_accessible(endpoint):
-    """Test that public endpoints are accessible"""
+def test_get_endpoint_status(endpoint, expected_status, client):
+    """Test status codes of public GET endpoints and invalid user IDs"""
     response = client.get(endpoint)
-    assert response.status_code == 200
-
-@pytest.mark.parametrize("invalid_id", [999, 0, -1, 10000])
-def test_get_user_invalid_ids(invalid_id):
-    """Test various invalid user IDs"""
-    response = client.get(f"/users/{invalid_id}")
-    assert response.status_code == 404
+    assert response.status_code == expected_status
 
 # ==================== PART 9: Testing Order Creation (Complex Logic) ====================
 
-def test_create_order_success():
-    """Test successful order creation"""
-    # Setup authentication
-    mock_user = User(id=1, name="Test User", email="test@example.com", role="user")
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    
-    # Also need to setup database for order to work
+# Order tests only write product stock, so users can be shared and only the
+# product row needs a fresh copy per test
+_ORDER_USER = {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"}
+_ORDER_PRODUCT = {"id": 1, "name": "Test Product", "price": 10.0, "stock": 10}
+
+def fresh_order_db():
+    """Order-test database with its own copy of the mutable product row"""
+    return {"users": {1: _ORDER_USER}, "products": {1: dict(_ORDER_PRODUCT)}}
+
+@pytest.fixture
+def order_env(override):
+    """A fresh order database installed as get_database"""
+    test_db = fresh_order_db()
+    override(get_database, lambda: test_db)
+    return test_db
+
+@pytest.mark.parametrize("payload,expected_status,detail", [
+    ({"user_id": 1, "product_id": 1, "quantity": 2}, 201, None),
+    ({"user_id": 1, "product_id": 1, "quantity": 99999}, 400, "insufficient stock"),
+    ({"user_id": 1, "product_id": 999, "quantity": 1}, 404, "product"),
+], ids=["success", "insufficient-stock", "invalid-product"])
+def test_create_order(auth_client, order_env, payload, expected_status, detail):
+    """Test order creation: success, insufficient stock and unknown product"""
+    initial_stock = order_env["products"][1]["stock"]
+    
+    response = auth_client.post("/orders", json=payload)
+    
+    assert response.status_code == expected_status
+    if detail is not None:
+        assert detail in response.json()["detail"].lower()
+        # A rejected order leaves stock untouched
+        assert order_env["products"][1]["stock"] == initial_stock
+        return
+    
+    order = response.json()
+    assert order["quantity"] == payload["quantity"]
+    assert order["user_id"] == payload["user_id"]
+    assert order["product_id"] == payload["product_id"]
+    assert "total_price" in order
+    
+    # Verify stock was reduced
+    response = auth_client.get("/products/1")
+    assert response.json()["stock"] == initial_stock - payload["quantity"]
+
+def test_list_my_orders(auth_client, override, regular_user):
+    """Test that /orders/me only returns the current user's orders"""
     test_db = {
-        "users": {1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"}},
+        "users": {
+            1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"},
+            2: {"id": 2, "name": "Other User", "email": "other@example.com", "role": "user"},
+        },
         "products": {1: {"id": 1, "name": "Test Product", "price": 10.0, "stock": 10}}
     }
-    app.dependency_overrides[get_database] = lambda: test_db
-    
-    try:
-        # Get initial product stock
-        response = client.get("/products/1")
-        initial_stock = response.json()["stock"]
-        
-        # Create order
-        response = client.post(
-            "/orders",
-            json={"user_id": 1, "product_id": 1, "quantity": 2}
-        )
-        
-        assert response.status_code == 201
-        order = response.json()
-        assert order["quantity"] == 2
-        assert order["user_id"] == 1
-        assert order["product_id"] == 1
-        assert "total_price" in order
-        
-        # Verify stock was reduced
-        response = client.get("/products/1")
-        new_stock = response.json()["stock"]
-        assert new_stock == initial_stock - 2
-        
-    finally:
-        app.dependency_overrides.clear()
-
-def test_create_order_insufficient_stock():
-    """Test order creation with insufficient stock"""
-    mock_user = User(id=1, name="Test User", email="test@example.com", role="user")
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    
-    # Setup database with limited stock
-    test_db = {
-        "users": {1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"}},
-        "products": {1: {"id": 1, "name": "Test Product", "price": 10.0, "stock": 5}}
-    }
-    app.dependency_overrides[get_database] = lambda: test_db
-    
-    try:
-        # Try to order more than available stock
-        response = client.post(
-            "/orders",
-            json={"user_id": 1, "product_id": 1, "quantity": 99999}
-        )
-        
-        assert response.status_code == 400
-        assert "insufficient stock" in response.json()["detail"].lower()
-        
-    finally:
-        app.dependency_overrides.clear()
-
-def test_create_order_invalid_product():
-    """Test order creation with non-existent product"""
-    mock_user = User(id=1, name="Test User", email="test@example.com", role="user")
-    app.dependency_overrides[get_current_user] = lambda: mock_user
-    
-    # Setup database with user but no products
-    test_db = {
-        "users": {1: {"id": 1, "name": "Test User", "email": "test@example.com", "role": "user"}},
-        "products": {}
-    }
-    app.dependency_overrides[get_database] = lambda: test_db
-    
-    try:
-        response = client.post(
-            "/orders",
-            json={"user_id": 1, "product_id": 999, "quantity": 1}
-        )
-        
-        assert response.status_code == 404
-        assert "product" in response.json()["detail"].lower()
-        
-    finally:
-        app.dependency_overrides.clear()
+    override(get_database, lambda: test_db)
+    
+    # auth_client is authenticated as regular_user, who has ID 2
+    auth_client.post("/orders", json={"user_id": 2, "product_id": 1, "quantity": 1})
+    auth_client.post("/orders", json={"user_id": 2, "product_id": 1, "quantity": 3})
+    
+    response = auth_client.get("/orders/me")
+    assert response.status_code == 200
+    orders = response.json()
+    assert [o["quantity"] for o in orders] == [1, 3]
+    assert all(o["user_id"] == regular_user.id for o in orders)
 
 # ==================== PART 10: Testing with Pytest Marks ====================
 
 @pytest.mark.slow
-def test_slow_operation():
+def test_slow_operation(client):
     """
     Mark slow tests
     Run with: pytest -v -m slow
@@ -526,7 +580,7 @@ def test_slow_operation():
     assert response.status_code == 200
 
 @pytest.mark.integration
-def test_integration_example():
+def test_integration_example(client):
     """
     Mark integration tests
     Run with: pytest -v -m integration
@@ -536,40 +590,28 @@ def test_integration_example():
 
 # ==================== PART 11: Setup and Teardown ====================
 
-class TestWithSetupTeardown:
-    """
-    Test class demonstrating setup and teardown
-    """
-    
-    @classmethod
-    def setup_class(cls):
-        """Run once before all tests in class"""
-        print("\n🔧 Setting up test class...")
-        cls.test_data = {"initialized": True}
-    
-    @classmethod
-    def teardown_class(cls):
-        """Run once after all tests in class"""
-        print("\n🧹 Tearing down test class...")
-    
-    def setup_method(self):
-        """Run before each test method"""
-        self.request_count = 0
-    
-    def teardown_method(self):
-        """Run after each test method"""
-        app.dependency_overrides.clear()
-    
-    def test_with_setup(self):
-        """Test that uses setup data"""
-        assert self.test_data["initialized"] is True
-        self.request_count += 1
-        response = client.get("/")
-        assert response.status_code == 200
+@pytest.fixture(scope="module")
+def setup_data():
+    """Setup run once for the module; code after yield is the teardown"""
+    data = {"initialized": True}
+    yield data
+    data.clear()
+
+@pytest.fixture
+def request_count():
+    """Fresh per-test state (what setup_method would reset)"""
+    return [0]
+
+def test_with_setup(setup_data, request_count, client):
+    """Test that uses setup data"""
+    assert setup_data["initialized"] is True
+    request_count[0] += 1
+    response = client.get("/")
+    assert response.status_code == 200
 
 # ==================== PART 12: Testing Response Models ====================
 
-def test_user_response_model_validation():
+def test_user_response_model_validation(client):
     """Test that response conforms to Pydantic model"""
     response = client.get("/users/1")
     
@@ -587,7 +629,7 @@ def test_user_response_model_validation():
     assert isinstance(user["name"], str)
     assert "@" in user["email"]  # Basic email validation
 
-def test_product_response_model_validation():
+def test_product_response_model_validation(client):
     """Test product response model"""
     # First get list of products to ensure one exists
     response = client.get("/products")
@@ -595,7 +637,6 @@ def test_product_response_model_validation():
     
     if not products:
         # If no products, skip this test
-        import pytest
         pytest.skip("No products available for testing")
     
     product_id = products[0]["id"]
@@ -607,33 +648,40 @@ def test_product_response_model_validation():
     assert product["price"] > 0  # Price must be positive
     assert product["stock"] >= 0  # Stock must be non-negative
 
-# ==================== PART 13: Context Manager for Overrides ====================
+def test_large_list_response_is_gzipped(client, override):
+    """List responses over the GZip threshold are compressed, small ones are not"""
+    big_db = {
+        "users": {
+            i: {"id": i, "name": f"User {i}", "email": f"user{i}@example.com", "role": "user"}
+            for i in range(1, 51)
+        },
+        "products": {}
+    }
+    override(get_database, lambda: big_db)
+    
+    response = client.get("/users", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 50
+    
+    response = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
 
-from contextlib import contextmanager
+# ==================== PART 13: Override Fixture ====================
 
-@contextmanager
-def override_dependency(dependency, override):
+def test_with_override_fixture(client, override):
     """
-    Context manager for dependency overrides
-    Ensures cleanup even if test fails
+    Test using the `override` fixture from conftest.py
+    Overrides are cleared automatically after every test, even if it fails
     """
-    app.dependency_overrides[dependency] = override
-    try:
-        yield
-    finally:
-        app.dependency_overrides.pop(dependency, None)
-
-def test_with_context_manager():
-    """Test using context manager for cleaner override management"""
     mock_user = User(id=50, name="Context User", email="context@example.com", role="admin")
     
-    with override_dependency(get_current_user, lambda: mock_user):
-        with override_dependency(require_admin, lambda: mock_user):
-            response = client.post(
-                "/products",
-                json={"name": "Context Product", "price": 29.99, "stock": 5}
-            )
-            assert response.status_code == 201
+    override(get_current_user, lambda: mock_user)
+    override(require_admin, lambda: mock_user)
+    response = client.post(
+        "/products",
+        json={"name": "Context Product", "price": 29.99, "stock": 5}
+    )
+    assert response.status_code == 201
 
 # ==================== PART 14: Async Testing (if needed) ====================
 
@@ -642,15 +690,13 @@ async def test_async_example():
     """
     Example of async test (requires pytest-asyncio)
     Install: pip install pytest-asyncio
-    """
-    # For async endpoints, use httpx.AsyncClient instead
-    # from httpx import AsyncClient
-    # async with AsyncClient(app=app, base_url="http://test") as ac:
-    #     response = await ac.get("/")
-    #     assert response.status_code == 200
     
-    # For now, just use sync client
-    response = client.get("/")
+    httpx.AsyncClient calls the app in-process on the test's own event loop,
+    which pytest.ini shares across the session instead of making one per test.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/")
     assert response.status_code == 200
 
 # ==================== Summary ====================
@@ -687,7 +733,7 @@ Key Testing Concepts Demonstrated:
    - Clear test names
    - Arrange-Act-Assert pattern
    - Cleanup after tests
-   - Context managers for safety
+   - Autouse fixtures for safe override cleanup
 
 Run specific test categories:
     pytest test_testing_basics.py -k "auth" -v          # Tests with 'auth' in name
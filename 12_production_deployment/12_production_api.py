@@ -14,15 +14,18 @@ import logging
 import os
 import sys
 import time
-import uuid
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Optional
 
+import orjson
+from anyio import to_thread
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, Response
+from pydantic import AliasChoices, BaseModel, Field
 from pydantic_settings import BaseSettings
 
 
@@ -38,7 +41,14 @@ class Settings(BaseSettings):
     # Server settings
     host: str = "0.0.0.0"
     port: int = 8000
-    workers: int = 4
+    # Worker processes for `python 12_production_api.py` (ignored with DEBUG
+    # reload). WEB_CONCURRENCY is the name most PaaS hosts set. gunicorn.conf.py
+    # uses the (2 x cores) + 1 rule of thumb; async workers seldom gain past
+    # one or two per core, so start at the core count and measure.
+    workers: int = Field(
+        default=4,
+        validation_alias=AliasChoices("WORKERS", "WEB_CONCURRENCY", "UVICORN_WORKERS")
+    )
     
     # CORS settings
     cors_origins: str = Field(default="*", alias="CORS_ORIGINS")
@@ -46,6 +56,14 @@ class Settings(BaseSettings):
     # Database settings (example)
     database_url: str = Field(default="sqlite:///./app.db", alias="DATABASE_URL")
     
+    # Most items the in-memory store keeps before evicting the least recently used
+    max_items: int = Field(default=10_000, alias="MAX_ITEMS")
+    
+    # Threads shared by sync (def) endpoints and dependencies in each worker
+    # process. AnyIO's default is 40; raise it for sync handlers that block on
+    # I/O, and remember the total across workers is workers x this.
+    threadpool_size: int = Field(default=40, alias="THREADPOOL_SIZE")
+    
     # Logging
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     
@@ -61,20 +79,59 @@ settings = Settings()
 
 
 # ========== Logging Configuration ==========
+# The current request's ID, set once by the request middleware. Each request
+# runs in its own task (and so its own context), so concurrent requests never
+# see each other's value; "-" marks log lines emitted outside a request.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp every log record with the current request ID"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class OrjsonFormatter(logging.Formatter):
+    """
+    Render each record as one JSON object per line
+    orjson builds and escapes the whole line in one call, so quotes or
+    newlines in a message can't break the output the way they could when
+    fields were spliced into a JSON-shaped format string.
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "name": record.name,
+            "level": record.levelname,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
 def setup_logging():
     """Configure structured logging for production"""
-    log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # The filter goes on the handler rather than a logger so records that
+    # propagate up from other loggers (uvicorn, libraries) get the ID too
+    handler = logging.StreamHandler(sys.stdout)
+    handler.addFilter(RequestIdFilter())
     
     # JSON logging for production
     if settings.environment == "production":
-        log_format = '{"time":"%(asctime)s", "name":"%(name)s", "level":"%(levelname)s", "message":"%(message)s"}'
+        handler.setFormatter(OrjsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
     
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout)
-        ]
+        handlers=[handler]
     )
     
     # Configure uvicorn logger
@@ -97,6 +154,10 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.environment}")
     logger.info(f"Debug mode: {settings.debug}")
     
+    # FastAPI runs sync endpoints on AnyIO's default thread limiter; it must
+    # be resized from inside the running event loop, hence here
+    to_thread.current_default_thread_limiter().total_tokens = settings.threadpool_size
+    
     # Initialize resources (database connections, cache, etc.)
     # await database.connect()
     
@@ -108,6 +169,40 @@ async def lifespan(app: FastAPI):
     # await database.disconnect()
 
 
+# ========== Request IDs ==========
+# IDs are 32 hex characters (128 random bits, like a UUID4 without dashes)
+# cut from a pool refilled with one os.urandom call per 512 IDs, instead of
+# building and formatting a uuid.UUID object on every request.
+_ID_HEX_LEN = 32
+_ID_POOL_SIZE = 512
+_id_pool = ""
+_id_pos = 0
+
+
+def next_id() -> str:
+    """Return a fresh random 32-character hex ID"""
+    global _id_pool, _id_pos
+    if _id_pos >= len(_id_pool):
+        _id_pool = os.urandom(_ID_HEX_LEN // 2 * _ID_POOL_SIZE).hex()
+        _id_pos = 0
+    start = _id_pos
+    _id_pos = start + _ID_HEX_LEN
+    return _id_pool[start:_id_pos]
+
+
+_MAX_REQUEST_ID_LEN = 128
+
+
+def _valid_request_id(value: Optional[str]) -> bool:
+    """Whether an inbound X-Request-ID is safe to reuse in headers and logs"""
+    return (
+        bool(value)
+        and len(value) <= _MAX_REQUEST_ID_LEN
+        and value.isascii()
+        and value.isprintable()
+    )
+
+
 # ========== FastAPI Application ==========
 app = FastAPI(
     title=settings.app_name,
@@ -121,51 +216,81 @@ app = FastAPI(
 
 # ========== Middleware ==========
 # CORS Middleware
-origins = settings.cors_origins.split(",")
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS_ORIGINS is parsed once here. An empty value means no cross-origin
+# access, so the middleware is left out entirely. Browsers refuse credentials
+# with a wildcard origin, so "*" turns credentials off; that also lets
+# Starlette send a fixed "Access-Control-Allow-Origin: *" instead of echoing
+# each request's Origin back.
+origins = [origin.strip() for origin in settings.cors_origins.split(",") if origin.strip()]
+if origins:
+    allow_all = "*" in origins
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"] if allow_all else origins,
+        allow_credentials=not allow_all,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
 
 
 # Request ID and Logging Middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Add request ID and log all requests"""
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-    
-    start_time = time.time()
-    
-    logger.info(
-        f"Request started",
-        extra={
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "client": request.client.host if request.client else None
-        }
-    )
-    
-    response = await call_next(request)
+# A plain ASGI middleware rather than @app.middleware("http"): that decorator
+# goes through BaseHTTPMiddleware, which runs the app in an extra task and
+# streams the response through a memory channel on every request.
+class RequestIDMiddleware:
+    """Add request ID and timing headers, and log all requests"""
     
-    process_time = time.time() - start_time
-    response.headers["X-Request-ID"] = request_id
-    response.headers["X-Process-Time"] = str(process_time)
+    def __init__(self, app):
+        self.app = app
     
-    logger.info(
-        f"Request completed",
-        extra={
-            "request_id": request_id,
-            "status_code": response.status_code,
-            "process_time": f"{process_time:.4f}s"
-        }
-    )
-    
-    return response
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Keep the caller's correlation ID (e.g. set by a gateway or load
+        # balancer) so one ID follows the request across services; only mint
+        # one if absent
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if not _valid_request_id(request_id):
+            request_id = next_id()
+        id_header = (b"x-request-id", request_id.encode())
+        
+        # Kept on request.state for the exception handler, which runs after
+        # this middleware has reset the context variable
+        scope.setdefault("state", {})["request_id"] = request_id
+        token = request_id_var.set(request_id)
+        start_time = time.perf_counter()
+        status_code = None
+        
+        async def send_with_headers(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                process_time = time.perf_counter() - start_time
+                message["headers"] = [
+                    *message.get("headers", ()),
+                    id_header,
+                    (b"x-process-time", f"{process_time:.4f}".encode()),
+                ]
+            await send(message)
+        
+        try:
+            logger.info("Request started: %s %s", scope["method"], scope["path"])
+            await self.app(scope, receive, send_with_headers)
+            logger.info(
+                "Request completed: %s in %.4fs",
+                status_code, time.perf_counter() - start_time
+            )
+        finally:
+            request_id_var.reset(token)
+
+
+app.add_middleware(RequestIDMiddleware)
 
 
 # ========== Models ==========
@@ -193,20 +318,48 @@ class MessageResponse(BaseModel):
 
 
 # ========== In-memory storage (replace with database in production) ==========
-items_db = {}
+# item_id -> (Item, its JSON bytes). Items never change after creation, so
+# each is serialized once on insert and the read endpoints send those bytes
+# as-is. Kept in least-recently-used order and capped at settings.max_items.
+items_db: "OrderedDict[str, tuple[Item, bytes]]" = OrderedDict()
+
+
+# ========== Probe Responses ==========
+# /health and /ready are polled by load balancers and orchestrators many times
+# a second. /ready never changes, and /health only changes when its
+# one-second-resolution timestamp does, so both are sent as prebuilt JSON.
+_READY_BODY = orjson.dumps({"status": "ready"})
+
+_health_second = -1
+_health_body = b""
+
+
+def _health_bytes() -> bytes:
+    """The /health JSON body, rebuilt at most once per second"""
+    global _health_second, _health_body
+    second = int(time.time())
+    if second != _health_second:
+        _health_body = orjson.dumps({
+            "status": "healthy",
+            "environment": settings.environment,
+            "version": settings.app_version,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        })
+        _health_second = second
+    return _health_body
 
 
 # ========== Endpoints ==========
 @app.get("/", response_model=MessageResponse)
-async def root(request: Request):
+async def root():
     """Root endpoint"""
     return {
         "message": f"Welcome to {settings.app_name}",
-        "request_id": request.state.request_id
+        "request_id": request_id_var.get()
     }
 
 
-@app.get("/health", response_model=HealthResponse, tags=["Monitoring"])
+@app.get("/health", responses={200: {"model": HealthResponse}}, tags=["Monitoring"])
 async def health_check():
     """
     Health check endpoint for load balancers and monitoring tools
@@ -218,12 +371,7 @@ async def health_check():
     # except Exception:
     #     raise HTTPException(status_code=503, detail="Database unavailable")
     
-    return {
-        "status": "healthy",
-        "environment": settings.environment,
-        "version": settings.app_version,
-        "timestamp": datetime.utcnow().isoformat()
-    }
+    return Response(_health_bytes(), media_type="application/json")
 
 
 @app.get("/ready", tags=["Monitoring"])
@@ -232,7 +380,7 @@ async def readiness_check():
     Readiness check endpoint for Kubernetes and orchestrators
     Returns 200 when app is ready to accept traffic
     """
-    return {"status": "ready"}
+    return Response(_READY_BODY, media_type="application/json")
 
 
 @app.get("/metrics", tags=["Monitoring"])
@@ -248,9 +396,9 @@ async def metrics():
 
 
 @app.post("/items", response_model=Item, status_code=status.HTTP_201_CREATED, tags=["Items"])
-async def create_item(item: ItemCreate, request: Request):
+async def create_item(item: ItemCreate):
     """Create a new item"""
-    item_id = str(uuid.uuid4())
+    item_id = next_id()
     
     new_item = Item(
         id=item_id,
@@ -260,24 +408,23 @@ async def create_item(item: ItemCreate, request: Request):
         created_at=datetime.utcnow().isoformat()
     )
     
-    items_db[item_id] = new_item
+    body = orjson.dumps(new_item.model_dump())
+    items_db[item_id] = (new_item, body)
+    if len(items_db) > settings.max_items:
+        items_db.popitem(last=False)
     
-    logger.info(
-        f"Item created",
-        extra={
-            "request_id": request.state.request_id,
-            "item_id": item_id,
-            "item_name": item.name
-        }
-    )
+    logger.info("Item created: %s (%s)", item_id, item.name)
     
-    return new_item
+    return Response(body, status_code=status.HTTP_201_CREATED, media_type="application/json")
 
 
 @app.get("/items", response_model=list[Item], tags=["Items"])
 async def list_items():
     """List all items"""
-    return list(items_db.values())
+    return Response(
+        b"[" + b",".join(body for _, body in items_db.values()) + b"]",
+        media_type="application/json"
+    )
 
 
 @app.get("/items/{item_id}", response_model=Item, tags=["Items"])
@@ -289,11 +436,12 @@ async def get_item(item_id: str):
             content={"detail": f"Item {item_id} not found"}
         )
     
-    return items_db[item_id]
+    items_db.move_to_end(item_id)
+    return Response(items_db[item_id][1], media_type="application/json")
 
 
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT, tags=["Items"])
-async def delete_item(item_id: str, request: Request):
+async def delete_item(item_id: str):
     """Delete an item"""
     if item_id not in items_db:
         return JSONResponse(
@@ -303,13 +451,7 @@ async def delete_item(item_id: str, request: Request):
     
     del items_db[item_id]
     
-    logger.info(
-        f"Item deleted",
-        extra={
-            "request_id": request.state.request_id,
-            "item_id": item_id
-        }
-    )
+    logger.info("Item deleted: %s", item_id)
     
     return None
 
@@ -319,16 +461,11 @@ async def delete_item(item_id: str, request: Request):
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
     request_id = getattr(request.state, "request_id", "unknown")
+    # Restore the ID for this log line; the handler runs in the request's own
+    # context, so there is nothing to reset afterwards
+    request_id_var.set(request_id)
     
-    logger.error(
-        f"Unhandled exception",
-        extra={
-            "request_id": request_id,
-            "error": str(exc),
-            "path": request.url.path
-        },
-        exc_info=True
-    )
+    logger.error("Unhandled exception on %s: %s", request.url.path, exc, exc_info=True)
     
     return JSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -342,10 +479,22 @@ async def global_exception_handler(request: Request, exc: Exception):
 if __name__ == "__main__":
     import uvicorn
     
-    uvicorn.run(
-        "12_production_api:app",
+    # uvloop (libuv event loop) and httptools (C HTTP parser) come with
+    # uvicorn[standard]; naming them makes a missing install fail at startup
+    # instead of silently falling back to asyncio + h11. The access log is off
+    # because RequestIDMiddleware already logs every request.
+    run_kwargs = dict(
         host=settings.host,
         port=settings.port,
-        reload=settings.debug,
-        log_level=settings.log_level.lower()
+        loop="uvloop",
+        http="httptools",
+        log_level=settings.log_level.lower(),
+        access_log=False
     )
+    # uvicorn can't reload and run several workers at once
+    if settings.debug:
+        run_kwargs["reload"] = True
+    else:
+        run_kwargs["workers"] = settings.workers
+    
+    uvicorn.run("12_production_api:app", **run_kwargs)
@@ -3,6 +3,10 @@ Test Suite for Production API
 Tests health checks, endpoints, middleware, and error handling
 """
 
+import importlib.util
+import pathlib
+import sys
+
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch
@@ -14,7 +18,27 @@ os.environ["DEBUG"] = "false"
 os.environ["DATABASE_URL"] = "sqlite:///./test.db"
 os.environ["LOG_LEVEL"] = "ERROR"  # Reduce noise during tests
 
-from 12_production_api import app, settings
+
+def load_module(file_name, module_name):
+    """
+    Import an example file whose name isn't a valid identifier
+    (`import 12_production_api` is a SyntaxError). The module is registered
+    in sys.modules so patch() can find it by module_name.
+    """
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    spec = importlib.util.spec_from_file_location(
+        module_name, pathlib.Path(__file__).with_name(file_name)
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+production_api = load_module("12_production_api.py", "production_api")
+app = production_api.app
+settings = production_api.settings
 
 
 @pytest.fixture
@@ -174,7 +198,18 @@ class TestMiddleware:
         response = client.get("/")
         assert "X-Request-ID" in response.headers
         assert len(response.headers["X-Request-ID"]) > 0
-    
+
+    def test_inbound_request_id_is_reused(self, client):
+        """Test that a caller-supplied request ID is echoed back"""
+        response = client.get("/", headers={"X-Request-ID": "abc-123"})
+        assert response.headers["X-Request-ID"] == "abc-123"
+
+    def test_oversized_request_id_is_replaced(self, client):
+        """Test that an unusable inbound request ID gets a fresh one"""
+        response = client.get("/", headers={"X-Request-ID": "x" * 500})
+        assert response.headers["X-Request-ID"] != "x" * 500
+        assert len(response.headers["X-Request-ID"]) == 32
+
     def test_process_time_header(self, client):
         """Test that process time is added to response headers"""
         response = client.get("/")
@@ -208,7 +243,7 @@ class TestErrorHandling:
         response = client.put("/health")
         assert response.status_code == 405
     
-    @patch('12_production_api.items_db', new={})
+    @patch('production_api.items_db', new={})
     def test_global_exception_handler(self, client):
         """Test global exception handler"""
         # This is a basic test - in a real scenario, you'd trigger an actual exception
@@ -233,7 +268,7 @@ class TestConfiguration:
 class TestDocs:
     """Test API documentation endpoints"""
     
-    def test_docs_disabled_in_production(self):
+    def test_docs_disabled_in_production(self, client):
         """Test that docs are disabled when debug=False"""
         # In test/production mode with debug=False, docs should be None
         if not settings.debug: